@@ -0,0 +1,321 @@
+"""Spatial indexes over `(x, y)` tuple points, named tuples included."""
+
+import heapq
+import math
+import random
+import sys
+import time
+from typing import (
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+
+class ClassBasedPoint(NamedTuple):
+    """Same shape as `ClassBasedPoint` in `named_tuples.py`, for the benchmark."""
+
+    x: int
+    y: int
+
+
+Cell = Tuple[int, int]
+XY = Tuple[int, int]
+# Structural, so any named tuple of two ints is accepted and handed back as is
+P = TypeVar("P", bound=XY)
+
+
+def _dist2(a: XY, b: XY) -> int:
+    dx = a[0] - b[0]
+    dy = a[1] - b[1]
+    return dx * dx + dy * dy
+
+
+def brute_force_nearest(points: List[P], query: XY, k: int = 1) -> List[P]:
+    """Linear scan for the `k` points closest to `query`."""
+    return heapq.nsmallest(k, points, key=lambda p: _dist2(p, query))
+
+
+def brute_force_range(
+    points: List[P], x_min: int, y_min: int, x_max: int, y_max: int
+) -> List[P]:
+    """Linear scan for the points inside a closed bounding box."""
+    return [p for p in points if x_min <= p[0] <= x_max and y_min <= p[1] <= y_max]
+
+
+class GridIndex(Generic[P]):
+    """Uniform grid hash: each point is bucketed by `(x // cell_size, y // cell_size)`.
+
+    Supports incremental inserts, so it suits point sets that keep growing.
+    """
+
+    def __init__(self, cell_size: int) -> None:
+        if cell_size <= 0:
+            raise ValueError("cell_size must be positive")
+        self.cell_size = cell_size
+        self._cells: Dict[Cell, List[P]] = {}
+        self._size = 0
+        self._min_cell: Optional[Cell] = None
+        self._max_cell: Optional[Cell] = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _cell_of(self, x: int, y: int) -> Cell:
+        return x // self.cell_size, y // self.cell_size
+
+    def _extend_bounds(self, cx: int, cy: int) -> None:
+        if self._min_cell is None or self._max_cell is None:
+            self._min_cell = self._max_cell = (cx, cy)
+            return
+        self._min_cell = (min(self._min_cell[0], cx), min(self._min_cell[1], cy))
+        self._max_cell = (max(self._max_cell[0], cx), max(self._max_cell[1], cy))
+
+    def insert(self, point: P) -> None:
+        """Add a single point."""
+        cell = self._cell_of(point[0], point[1])
+        bucket = self._cells.get(cell)
+        if bucket is None:
+            self._cells[cell] = [point]
+            self._extend_bounds(*cell)
+        else:
+            bucket.append(point)
+        self._size += 1
+
+    def bulk_load(self, points: Iterable[P]) -> None:
+        """Add many points, updating the occupied-cell bounds once at the end."""
+        cells = self._cells
+        cell_size = self.cell_size
+        size = 0
+        for point in points:
+            cell = (point[0] // cell_size, point[1] // cell_size)
+            bucket = cells.get(cell)
+            if bucket is None:
+                cells[cell] = [point]
+            else:
+                bucket.append(point)
+            size += 1
+        self._size += size
+        for cx, cy in cells:
+            self._extend_bounds(cx, cy)
+
+    def range_query(self, x_min: int, y_min: int, x_max: int, y_max: int) -> List[P]:
+        """Return the points inside a closed bounding box."""
+        if self._min_cell is None or self._max_cell is None:
+            return []
+        cx_min, cy_min = self._cell_of(x_min, y_min)
+        cx_max, cy_max = self._cell_of(x_max, y_max)
+        # Only visit cells that can be occupied, however large the box
+        first_cx = max(cx_min, self._min_cell[0])
+        first_cy = max(cy_min, self._min_cell[1])
+        last_cx = min(cx_max, self._max_cell[0])
+        last_cy = min(cy_max, self._max_cell[1])
+        result: List[P] = []
+        cells = self._cells
+        for cx in range(first_cx, last_cx + 1):
+            for cy in range(first_cy, last_cy + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    continue
+                if cx_min < cx < cx_max and cy_min < cy < cy_max:
+                    # Interior cells lie entirely inside the box
+                    result.extend(bucket)
+                else:
+                    result.extend(
+                        p
+                        for p in bucket
+                        if x_min <= p[0] <= x_max and y_min <= p[1] <= y_max
+                    )
+        return result
+
+    def _ring(self, center: Cell, radius: int) -> Iterable[Cell]:
+        cx, cy = center
+        if radius == 0:
+            yield center
+            return
+        for dx in range(-radius, radius + 1):
+            yield cx + dx, cy - radius
+            yield cx + dx, cy + radius
+        for dy in range(-radius + 1, radius):
+            yield cx - radius, cy + dy
+            yield cx + radius, cy + dy
+
+    def nearest(self, query: XY, k: int = 1) -> List[P]:
+        """Return the `k` nearest points, searching rings of cells outward."""
+        if k <= 0 or self._min_cell is None or self._max_cell is None:
+            return []
+        center = self._cell_of(query[0], query[1])
+        max_radius = max(
+            abs(center[0] - self._min_cell[0]),
+            abs(center[0] - self._max_cell[0]),
+            abs(center[1] - self._min_cell[1]),
+            abs(center[1] - self._max_cell[1]),
+        )
+        # Max-heap of (-distance², tie-breaker, point) holding the best k so far
+        best: List[Tuple[int, int, P]] = []
+        counter = 0
+        cells = self._cells
+        for radius in range(max_radius + 1):
+            for cell in self._ring(center, radius):
+                bucket = cells.get(cell)
+                if bucket is None:
+                    continue
+                for p in bucket:
+                    d = _dist2(p, query)
+                    counter += 1
+                    if len(best) < k:
+                        heapq.heappush(best, (-d, counter, p))
+                    elif d < -best[0][0]:
+                        heapq.heapreplace(best, (-d, counter, p))
+            # Any cell outside this ring is at least `radius * cell_size` away
+            if len(best) == k and -best[0][0] <= (radius * self.cell_size) ** 2:
+                break
+        return [p for _, _, p in sorted(best, key=lambda e: (-e[0], e[1]))]
+
+
+class KDTree(Generic[P]):
+    """Static 2-d tree, bulk loaded once from a collection of points.
+
+    The tree is implicit: points are reordered in place so that the median of every
+    sub-range is its splitting node, and no node objects are allocated.
+    """
+
+    def __init__(self, points: Iterable[P], leaf_size: int = 16) -> None:
+        self.leaf_size = max(1, leaf_size)
+        self._points: List[P] = list(points)
+        self._build(0, len(self._points), 0)
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def _build(self, lo: int, hi: int, axis: int) -> None:
+        stack = [(lo, hi, axis)]
+        pts = self._points
+        while stack:
+            lo, hi, axis = stack.pop()
+            if hi - lo <= self.leaf_size:
+                continue
+            pts[lo:hi] = sorted(pts[lo:hi], key=lambda p: p[axis])
+            mid = (lo + hi) // 2
+            stack.append((lo, mid, 1 - axis))
+            stack.append((mid + 1, hi, 1 - axis))
+
+    def nearest(self, query: XY, k: int = 1) -> List[P]:
+        """Return the `k` points closest to `query`."""
+        if k <= 0 or not self._points:
+            return []
+        pts = self._points
+        leaf_size = self.leaf_size
+        best: List[Tuple[int, int, P]] = []
+
+        def offer(i: int) -> None:
+            p = pts[i]
+            d = _dist2(p, query)
+            if len(best) < k:
+                heapq.heappush(best, (-d, i, p))
+            elif d < -best[0][0]:
+                heapq.heapreplace(best, (-d, i, p))
+
+        def search(lo: int, hi: int, axis: int) -> None:
+            if hi - lo <= leaf_size:
+                for i in range(lo, hi):
+                    offer(i)
+                return
+            mid = (lo + hi) // 2
+            offer(mid)
+            diff = query[axis] - pts[mid][axis]
+            if diff < 0:
+                near, far = (lo, mid), (mid + 1, hi)
+            else:
+                near, far = (mid + 1, hi), (lo, mid)
+            search(near[0], near[1], 1 - axis)
+            if len(best) < k or diff * diff < -best[0][0]:
+                search(far[0], far[1], 1 - axis)
+
+        search(0, len(pts), 0)
+        return [p for _, _, p in sorted(best, key=lambda e: (-e[0], e[1]))]
+
+    def range_query(self, x_min: int, y_min: int, x_max: int, y_max: int) -> List[P]:
+        """Return the points inside a closed bounding box."""
+        pts = self._points
+        leaf_size = self.leaf_size
+        bounds = ((x_min, x_max), (y_min, y_max))
+        result: List[P] = []
+        stack = [(0, len(pts), 0)]
+        while stack:
+            lo, hi, axis = stack.pop()
+            if hi - lo <= leaf_size:
+                result.extend(
+                    p
+                    for p in pts[lo:hi]
+                    if x_min <= p[0] <= x_max and y_min <= p[1] <= y_max
+                )
+                continue
+            mid = (lo + hi) // 2
+            p = pts[mid]
+            if x_min <= p[0] <= x_max and y_min <= p[1] <= y_max:
+                result.append(p)
+            low, high = bounds[axis]
+            if low <= p[axis]:
+                stack.append((lo, mid, 1 - axis))
+            if p[axis] <= high:
+                stack.append((mid + 1, hi, 1 - axis))
+        return result
+
+
+def _time_queries(
+    label: str, run: Callable[[ClassBasedPoint], object], queries: List[ClassBasedPoint]
+) -> None:
+    start = time.perf_counter()
+    for q in queries:
+        run(q)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24} {elapsed / len(queries) * 1e6:12.1f} us/query")
+
+
+def benchmark(n: int = 1_000_000, n_queries: int = 20, k: int = 10) -> None:
+    """Compare query latency of the grid and KD-tree against brute force."""
+    rng = random.Random(0)
+    extent = 1_000_000
+    points = [
+        ClassBasedPoint(rng.randrange(extent), rng.randrange(extent)) for _ in range(n)
+    ]
+    queries = [
+        ClassBasedPoint(rng.randrange(extent), rng.randrange(extent))
+        for _ in range(n_queries)
+    ]
+    # Aim for a handful of points per cell
+    cell_size = max(1, int(extent / math.sqrt(n / 4)))
+    box = extent // 100
+
+    start = time.perf_counter()
+    grid: GridIndex[ClassBasedPoint] = GridIndex(cell_size)
+    grid.bulk_load(points)
+    print(f"grid bulk load           {time.perf_counter() - start:12.2f} s")
+    start = time.perf_counter()
+    tree = KDTree(points)
+    print(f"kd-tree build            {time.perf_counter() - start:12.2f} s")
+
+    def box_of(q: ClassBasedPoint) -> Tuple[int, int, int, int]:
+        return q.x, q.y, q.x + box, q.y + box
+
+    _time_queries(
+        "brute force k-NN", lambda q: brute_force_nearest(points, q, k), queries
+    )
+    _time_queries("grid k-NN", lambda q: grid.nearest(q, k), queries)
+    _time_queries("kd-tree k-NN", lambda q: tree.nearest(q, k), queries)
+    _time_queries(
+        "brute force range", lambda q: brute_force_range(points, *box_of(q)), queries
+    )
+    _time_queries("grid range", lambda q: grid.range_query(*box_of(q)), queries)
+    _time_queries("kd-tree range", lambda q: tree.range_query(*box_of(q)), queries)
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
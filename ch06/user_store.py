@@ -0,0 +1,222 @@
+"""Batched SQLite persistence for `typed_new_user`."""
+
+import os
+import queue
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from types import TracebackType
+from typing import Iterator, List, Optional, Tuple, Type, TypeVar
+
+Row = Tuple[str, str, str]
+
+
+class User:
+    def __init__(self, name: str = "", email: str = "") -> None:
+        self.name = name
+        self.email = email
+
+
+class BasicUser(User):
+    def upgrade(self) -> None:
+        """Upgrade to Pro"""
+
+
+class ProUser(User):
+    def pay(self) -> None:
+        """Pay bill"""
+
+
+def connect(path: str) -> sqlite3.Connection:
+    """Open `path` in WAL mode, which lets readers proceed during a write."""
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    # In WAL mode, NORMAL only syncs at checkpoints and stays crash-safe
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS users ("
+        "id INTEGER PRIMARY KEY, kind TEXT NOT NULL, name TEXT, email TEXT)"
+    )
+    conn.commit()
+    return conn
+
+
+class ConnectionPool:
+    """At most `size` connections to one database, opened on first demand."""
+
+    def __init__(self, path: str, size: int = 4) -> None:
+        self.path = path
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        # One permit per connection that may still be opened
+        self._permits = threading.BoundedSemaphore(size)
+        # Guards `_closed` against connections being returned meanwhile
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _borrow(self) -> sqlite3.Connection:
+        while True:
+            if self._closed:
+                raise RuntimeError("connection pool is closed")
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            if self._permits.acquire(blocking=False):
+                try:
+                    return connect(self.path)
+                except BaseException:
+                    self._permits.release()
+                    raise
+            # Wake up now and then to notice the pool being closed
+            try:
+                return self._idle.get(timeout=0.05)
+            except queue.Empty:
+                pass
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection, blocking while all `size` of them are in use."""
+        conn = self._borrow()
+        try:
+            yield conn
+        finally:
+            with self._lock:
+                closed = self._closed
+                if not closed:
+                    self._idle.put(conn)
+            if closed:
+                conn.close()
+
+    def close(self) -> None:
+        """Close the idle connections now and borrowed ones when returned.
+
+        Borrowing a connection afterwards raises `RuntimeError`, as does waiting
+        for one when the pool is closed.
+        """
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+
+
+class UserStore:
+    """Buffer of new users, written `batch_size` at a time.
+
+    Each flush inserts the buffered rows with one `executemany` in one transaction,
+    so the cost of a commit is shared by the whole batch. Users added since the last
+    flush are lost if the process dies before `flush` or `close`.
+    """
+
+    def __init__(self, path: str, batch_size: int = 1000, pool_size: int = 4) -> None:
+        self.batch_size = batch_size
+        self.pool = ConnectionPool(path, pool_size)
+        self.flushes = 0
+        self._buffer: List[Row] = []
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "UserStore":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def add(self, user: User) -> None:
+        row = (type(user).__name__, user.name, user.email)
+        with self._lock:
+            self._buffer.append(row)
+            if len(self._buffer) < self.batch_size:
+                return
+            rows, self._buffer = self._buffer, []
+        self._write(rows)
+
+    def flush(self) -> None:
+        with self._lock:
+            rows, self._buffer = self._buffer, []
+        if rows:
+            self._write(rows)
+
+    def _write(self, rows: List[Row]) -> None:
+        try:
+            with self.pool.connection() as conn:
+                # The connection as a context manager commits, or rolls back on error
+                with conn:
+                    conn.executemany(
+                        "INSERT INTO users (kind, name, email) VALUES (?, ?, ?)", rows
+                    )
+        except BaseException:
+            # Nothing was committed: keep the rows, ahead of any added meanwhile
+            with self._lock:
+                self._buffer[:0] = rows
+            raise
+        with self._lock:
+            self.flushes += 1
+
+    def count(self) -> int:
+        """Number of users written so far, not counting the buffered ones."""
+        with self.pool.connection() as conn:
+            (count,) = conn.execute("SELECT COUNT(*) FROM users").fetchone()
+        return int(count)
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        finally:
+            self.pool.close()
+
+
+U = TypeVar("U", bound=User)
+
+
+def typed_new_user(
+    user_class: Type[U], store: UserStore, name: str = "", email: str = ""
+) -> U:
+    user = user_class(name, email)
+    store.add(user)
+    return user
+
+
+def benchmark(n: int = 20_000) -> None:
+    """Compare inserts per second with a commit per row and with batched commits."""
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = connect(os.path.join(tmp, "per_row.db"))
+        start = time.perf_counter()
+        for i in range(n):
+            user = ProUser(f"user {i}", f"user{i}@example.com")
+            with conn:
+                conn.execute(
+                    "INSERT INTO users (kind, name, email) VALUES (?, ?, ?)",
+                    (type(user).__name__, user.name, user.email),
+                )
+        per_row = time.perf_counter() - start
+        conn.close()
+        print(f"commit per row    {n / per_row:12,.0f} inserts/s")
+
+        for batch_size in (100, 1000, 10_000):
+            path = os.path.join(tmp, f"batched_{batch_size}.db")
+            start = time.perf_counter()
+            with UserStore(path, batch_size) as store:
+                for i in range(n):
+                    user_class = ProUser if i % 10 == 0 else BasicUser
+                    typed_new_user(
+                        user_class, store, f"user {i}", f"user{i}@example.com"
+                    )
+                store.flush()
+                elapsed = time.perf_counter() - start
+                assert store.count() == n
+            print(f"batches of {batch_size:<6,} {n / elapsed:12,.0f} inserts/s")
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
@@ -0,0 +1,81 @@
+"""A bulk alternative constructor, `make_many`, for slotted `Base[T]` subclasses."""
+
+import gc
+import sys
+import time
+from contextlib import contextmanager
+from typing import Callable, Generic, Iterator, List, Sequence, Tuple, Type, TypeVar
+
+T = TypeVar("T")
+
+
+class Base(Generic[T]):
+    """`Base` of `alternative_constructors.py`, slotted."""
+
+    __slots__ = ("item",)
+
+    Q = TypeVar("Q", bound="Base[T]")
+
+    def __init__(self, item: T) -> None:
+        self.item = item
+
+    @classmethod
+    def make_pair(cls: Type[Q], item: T) -> Tuple[Q, Q]:
+        return cls(item), cls(item)
+
+    @classmethod
+    def make_many(cls: Type[Q], items: Sequence[T]) -> List[Q]:
+        """`[cls(item) for item in items]`, with the cyclic garbage collector paused.
+
+        Otherwise the collector would repeatedly traverse the growing batch, which
+        costs more than the constructor calls themselves. `cls` is still called
+        for every item, driven from C by `map`, so subclasses may override `__new__`
+        and `__init__`.
+        """
+        with gc_paused():
+            return list(map(cls, items))
+
+
+@contextmanager
+def gc_paused() -> Iterator[None]:
+    """Disable the cyclic garbage collector, if enabled, for the duration."""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+class Sub(Base[T]):
+    __slots__ = ()
+
+
+def benchmark(n: int = 1_000_000) -> None:
+    """Compare `make_many` with a comprehension and `map` over `Sub`."""
+    items = [f"item {i}" for i in range(n)]
+
+    def comprehension() -> List[Sub[str]]:
+        return [Sub(item) for item in items]
+
+    def comprehension_gc_paused() -> List[Sub[str]]:
+        with gc_paused():
+            return [Sub(item) for item in items]
+
+    runs: List[Tuple[str, Callable[[], List[Sub[str]]]]] = [
+        ("comprehension", comprehension),
+        ("comprehension, no gc", comprehension_gc_paused),
+        ("make_many", lambda: Sub.make_many(items)),
+    ]
+    for label, run in runs:
+        start = time.perf_counter()
+        made = run()
+        elapsed = time.perf_counter() - start
+        assert made[-1].item == items[-1]
+        del made
+        print(f"{label:<21} {n / elapsed:14,.0f} instances/s")
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,269 @@
+"""A `Storage[Sequence[S]]` whose chunks live in a memory-mapped file.
+
+Layout::
+
+    magic | chunk 0 | ... | chunk n - 1 | offsets | chunk count | magic
+
+`offsets` holds `n + 1` unsigned 64-bit byte offsets, so chunk `i` is the slice
+between offsets `i` and `i + 1`. Opening a file only reads its tail, so it takes
+the same time whatever the size of the data.
+"""
+
+import mmap
+import os
+import random
+import sys
+import tempfile
+import time
+from array import array
+from collections import OrderedDict
+from types import TracebackType
+from typing import (
+    Any,
+    Callable,
+    Generic,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Type,
+    TypeVar,
+    Union,
+    overload,
+)
+
+MAGIC = b"CHUNKS01"
+
+T_co = TypeVar("T_co", covariant=True)
+S = TypeVar("S")
+
+
+class ChunkFileError(ValueError):
+    """Raised when a file is not a valid chunk file."""
+
+
+def write_chunks(
+    path: str, chunks: Iterable[Union[bytes, bytearray, memoryview]]
+) -> int:
+    """Write `chunks` to `path` one at a time; return the chunk count."""
+    offsets = array("Q", [len(MAGIC)])
+    with open(path, "wb") as out:
+        out.write(MAGIC)
+        for chunk in chunks:
+            out.write(chunk)
+            offsets.append(out.tell())
+        if sys.byteorder != "little":
+            offsets.byteswap()
+        offsets.tofile(out)
+        out.write((len(offsets) - 1).to_bytes(8, "little"))
+        out.write(MAGIC)
+    return len(offsets) - 1
+
+
+class ChunkedSequence(Sequence[S]):
+    """Read-only sequence of the chunks of a file written by `write_chunks`.
+
+    A chunk is read from the mapping and passed through `decode` the first time it
+    is accessed; the `cache_size` most recently used decoded chunks are kept, the
+    others are dropped and decoded again on their next access. Decoders that
+    return views into the mapping (such as `memoryview.cast`) keep it alive after
+    `close` until those views are dropped.
+    """
+
+    @overload
+    def __init__(self: "ChunkedSequence[bytes]", path: str) -> None:
+        ...
+
+    @overload
+    def __init__(
+        self, path: str, decode: Callable[[memoryview], S], cache_size: int = ...
+    ) -> None:
+        ...
+
+    @overload
+    def __init__(
+        self: "ChunkedSequence[bytes]", path: str, *, cache_size: int
+    ) -> None:
+        ...
+
+    def __init__(
+        self,
+        path: str,
+        decode: Callable[[memoryview], Any] = bytes,
+        cache_size: int = 8,
+    ) -> None:
+        self.decode: Callable[[memoryview], S] = decode
+        self.cache_size = cache_size
+        self.hits = 0
+        self.loads = 0
+        self._cache: "OrderedDict[int, S]" = OrderedDict()
+        self._file = open(path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ChunkFileError(f"{path}: empty file") from None
+        self._view = memoryview(self._mmap)
+        try:
+            self._read_index(path)
+        except BaseException:
+            self.close()
+            raise
+
+    def _read_index(self, path: str) -> None:
+        view = self._view
+        size = len(view)
+        if size < 32 or view[:8] != MAGIC or view[size - 8 :] != MAGIC:
+            raise ChunkFileError(f"{path}: not a chunk file")
+        count = int.from_bytes(view[size - 16 : size - 8], "little")
+        start = size - 16 - (count + 1) * 8
+        if start < len(MAGIC):
+            raise ChunkFileError(f"{path}: truncated chunk index")
+        if sys.byteorder == "little":
+            self._offsets: Sequence[int] = view[start : size - 16].cast("Q")
+        else:
+            offsets = array("Q", view[start : size - 16])
+            offsets.byteswap()
+            self._offsets = offsets
+
+    def __enter__(self) -> "ChunkedSequence[S]":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._cache.clear()
+        # One offset and no chunks, so `len` is 0 once closed
+        self._offsets = (0,)
+        self._view.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            # Decoded views are still alive; the mapping goes away with the last one
+            pass
+        self._file.close()
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    @overload
+    def __getitem__(self, index: int) -> S:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[S]:
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[S, List[S]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        cache = self._cache
+        chunk = cache.get(index)
+        if chunk is not None:
+            cache.move_to_end(index)
+            self.hits += 1
+            return chunk
+        if self._file.closed:
+            raise ValueError("chunk file is closed")
+        if not 0 <= index < len(self):
+            raise IndexError("chunk index out of range")
+        chunk = self.decode(self._view[self._offsets[index] : self._offsets[index + 1]])
+        self.loads += 1
+        if self.cache_size > 0:
+            cache[index] = chunk
+            if len(cache) > self.cache_size:
+                cache.popitem(last=False)
+        return chunk
+
+    def raw(self, index: int) -> memoryview:
+        """Return the undecoded bytes of one chunk without copying or caching."""
+        return self._view[self._offsets[index] : self._offsets[index + 1]]
+
+
+class Storage(Generic[T_co]):
+    """`Storage` of `restricted_methods_generic.py`.
+
+    Covariant, so that `Storage[ChunkedSequence[S]]` and `Storage[List[S]]` are both
+    accepted as `Storage[Sequence[S]]` by `first_chunk`.
+    """
+
+    def __init__(self, content: T_co) -> None:
+        self.content = content
+
+    def first_chunk(self: "Storage[Sequence[S]]") -> S:
+        return self.content[0]
+
+
+@overload
+def open_storage(path: str) -> Storage[ChunkedSequence[bytes]]:
+    ...
+
+
+@overload
+def open_storage(
+    path: str, decode: Callable[[memoryview], S], cache_size: int = ...
+) -> Storage[ChunkedSequence[S]]:
+    ...
+
+
+def open_storage(
+    path: str, decode: Callable[[memoryview], Any] = bytes, cache_size: int = 8
+) -> Storage[ChunkedSequence[Any]]:
+    """Open a chunk file as `Storage`; `first_chunk` then decodes only chunk 0."""
+    return Storage(ChunkedSequence(path, decode, cache_size))
+
+
+def benchmark(chunks: int = 64, chunk_size: int = 1 << 20) -> None:
+    """Compare eager and lazy opening, then replay skewed chunk accesses."""
+    block = os.urandom(chunk_size)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "data.chunks")
+        write_chunks(path, (block for _ in range(chunks)))
+
+        start = time.perf_counter()
+        with open(path, "rb") as src:
+            data = src.read()
+        eager = Storage(
+            [
+                data[i : i + chunk_size]
+                for i in range(8, 8 + chunks * chunk_size, chunk_size)
+            ]
+        )
+        eager.first_chunk()
+        eager_open = time.perf_counter() - start
+        del data, eager
+
+        start = time.perf_counter()
+        lazy = open_storage(path)
+        lazy.first_chunk()
+        lazy_open = time.perf_counter() - start
+        print(f"eager open + first_chunk {eager_open * 1e3:10.3f} ms")
+        print(f"lazy open + first_chunk  {lazy_open * 1e3:10.3f} ms")
+
+        # Skewed access: low-numbered chunks are requested far more often
+        rng = random.Random(0)
+        order = [
+            min(int(rng.paretovariate(1.0)) - 1, chunks - 1) for _ in range(10_000)
+        ]
+        content = lazy.content
+        start = time.perf_counter()
+        for index in order:
+            content[index]
+        elapsed = time.perf_counter() - start
+        print(
+            f"{len(order):,} accesses {elapsed * 1e3:10.3f} ms, "
+            f"{content.hits:,} cache hits, {content.loads:,} loads"
+        )
+        content.close()
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 64)
@@ -0,0 +1,177 @@
+"""Coalescing of high-frequency drag events."""
+
+import asyncio
+import sys
+import time
+from typing import AsyncIterator, Callable, Iterable, Iterator, List, Optional, Union
+
+from mouse_events import ClickEvent, DragEvent, drag_pool, mouse_event
+
+MouseEvent = Union[ClickEvent, DragEvent]
+
+
+class DragCoalescer:
+    """Merge runs of consecutive `DragEvent`s into single spans.
+
+    A span keeps the start point of its first drag and the end point of its latest
+    one. A lone drag is emitted as is; a longer span is emitted as a new event from
+    `drag_pool`, so the caller's events are never modified. A span
+    is emitted once it has absorbed `max_count` drags, once it is `window` seconds
+    old, before any `ClickEvent` (which passes through unchanged), or on `flush`.
+    """
+
+    def __init__(
+        self,
+        window: float = 0.016,
+        max_count: int = 64,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_count < 1:
+            raise ValueError("max_count must be at least 1")
+        self.window = window
+        self.max_count = max_count
+        self.clock = clock
+        self.received = 0
+        self.emitted = 0
+        self._span: Optional[DragEvent] = None
+        self._span_last: Optional[DragEvent] = None
+        self._span_count = 0
+        self._span_start = 0.0
+
+    @property
+    def saved(self) -> int:
+        """Downstream calls avoided so far."""
+        return self.received - self.emitted
+
+    @property
+    def deadline(self) -> Optional[float]:
+        """Clock time at which the pending span is due, if there is one."""
+        if self._span is None:
+            return None
+        return self._span_start + self.window
+
+    def push(self, event: MouseEvent) -> List[MouseEvent]:
+        """Take one event; return the events that are ready to go downstream."""
+        self.received += 1
+        if isinstance(event, ClickEvent):
+            ready = self.flush()
+            ready.append(event)
+            self.emitted += 1
+            return ready
+        if self._span is None:
+            self._span = event
+            self._span_count = 1
+            self._span_start = self.clock()
+        else:
+            self._span_last = event
+            self._span_count += 1
+        if self._span_count >= self.max_count or self.expired():
+            return self.flush()
+        return []
+
+    def expired(self) -> bool:
+        deadline = self.deadline
+        return deadline is not None and self.clock() >= deadline
+
+    def flush(self) -> List[MouseEvent]:
+        """Emit the pending span, if any."""
+        span, last = self._span, self._span_last
+        if span is None:
+            return []
+        self._span = self._span_last = None
+        self.emitted += 1
+        if last is not None:
+            span = drag_pool.acquire(span.x1, span.y1, last.x2, last.y2)
+        return [span]
+
+
+def coalesce(
+    events: Iterable[MouseEvent], coalescer: Optional[DragCoalescer] = None
+) -> Iterator[MouseEvent]:
+    """Generator form: the window is checked whenever an event arrives."""
+    coalescer = coalescer or DragCoalescer()
+    for event in events:
+        yield from coalescer.push(event)
+    yield from coalescer.flush()
+
+
+async def coalesce_async(
+    events: AsyncIterator[MouseEvent], coalescer: Optional[DragCoalescer] = None
+) -> AsyncIterator[MouseEvent]:
+    """Asyncio form of `coalesce`.
+
+    A pending span is also emitted when its window expires while the source is idle.
+    """
+    coalescer = coalescer or DragCoalescer()
+    queue: "asyncio.Queue[Optional[MouseEvent]]" = asyncio.Queue(maxsize=1024)
+
+    async def pump() -> None:
+        try:
+            async for event in events:
+                await queue.put(event)
+        finally:
+            await queue.put(None)
+
+    pump_task = asyncio.ensure_future(pump())
+    try:
+        while True:
+            deadline = coalescer.deadline
+            try:
+                if deadline is None:
+                    event = await queue.get()
+                else:
+                    timeout = max(0.0, deadline - coalescer.clock())
+                    event = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                for ready in coalescer.flush():
+                    yield ready
+                continue
+            if event is None:
+                break
+            for ready in coalescer.push(event):
+                yield ready
+        for ready in coalescer.flush():
+            yield ready
+        await pump_task
+    finally:
+        pump_task.cancel()
+
+
+def benchmark(n: int = 200_000, run_length: int = 50) -> None:
+    """Report how many downstream calls coalescing saves on a synthetic stream."""
+    events: List[MouseEvent] = []
+    for i in range(n):
+        if i % run_length == 0:
+            events.append(mouse_event(i, i))
+        else:
+            events.append(mouse_event(i, i, i + 1, i + 1))
+
+    coalescer = DragCoalescer(window=0.005)
+    start = time.perf_counter()
+    emitted = sum(1 for _ in coalesce(events, coalescer))
+    elapsed = time.perf_counter() - start
+    print(f"generator: {n:,} in, {emitted:,} out, {coalescer.saved:,} calls saved")
+    print(f"           {n / elapsed:,.0f} events/s")
+
+    async def source() -> AsyncIterator[MouseEvent]:
+        for i in range(n // 100):
+            yield mouse_event(i, i, i + 1, i + 1)
+            if i % 1000 == 999:
+                # Idle gap longer than the window: the pending span is flushed
+                await asyncio.sleep(0.01)
+
+    async def consume() -> DragCoalescer:
+        coalescer = DragCoalescer(window=0.005)
+        async for _ in coalesce_async(source(), coalescer):
+            pass
+        return coalescer
+
+    stats = asyncio.run(consume())
+    print(
+        f"asyncio:   {stats.received:,} in, {stats.emitted:,} out, "
+        f"{stats.saved:,} calls saved"
+    )
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
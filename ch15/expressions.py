@@ -0,0 +1,263 @@
+"""Hash-consed expression DAG with constant folding for `add`."""
+
+import operator
+import sys
+import time
+import tracemalloc
+import weakref
+from typing import Any, Callable, Dict, List, Mapping, Tuple, overload
+
+
+class Expression:
+    """Immutable, interned expression node.
+
+    Nodes are hash-consed: constructing a node equal to a live one returns that
+    node, so identical subtrees are shared and equality is identity.
+    """
+
+    __slots__ = ("__weakref__",)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __add__(self, other: "Expression") -> "Expression":
+        return add(self, other)
+
+
+class Literal(Expression):
+    __slots__ = ("value",)
+    value: int
+
+    _interned: "weakref.WeakValueDictionary[int, Literal]" = (
+        weakref.WeakValueDictionary()
+    )
+
+    def __new__(cls, value: int) -> "Literal":
+        if type(value) is not int:
+            # Interned by value, so `True` and `1.0` must not stand in for `1`:
+            # non-integers are rejected and int subclasses become plain ints
+            value = int(operator.index(value))
+        node = cls._interned.get(value)
+        if node is None:
+            node = super().__new__(cls)
+            object.__setattr__(node, "value", value)
+            cls._interned[value] = node
+        return node
+
+    def __repr__(self) -> str:
+        return f"Literal({self.value})"
+
+
+class Variable(Expression):
+    __slots__ = ("name",)
+    name: str
+
+    _interned: "weakref.WeakValueDictionary[str, Variable]" = (
+        weakref.WeakValueDictionary()
+    )
+
+    def __new__(cls, name: str) -> "Variable":
+        node = cls._interned.get(name)
+        if node is None:
+            node = super().__new__(cls)
+            object.__setattr__(node, "name", name)
+            cls._interned[name] = node
+        return node
+
+    def __repr__(self) -> str:
+        return f"Variable({self.name!r})"
+
+
+class Add(Expression):
+    """Sum of two nodes; build it with `add` so constants are folded."""
+
+    __slots__ = ("left", "right")
+    left: Expression
+    right: Expression
+
+    # Children hash by identity, and a live entry keeps them alive, so the key
+    # cannot be confused with a later node that reuses their ids
+    _interned: "weakref.WeakValueDictionary[Tuple[Expression, Expression], Add]" = (
+        weakref.WeakValueDictionary()
+    )
+
+    def __new__(cls, left: Expression, right: Expression) -> "Add":
+        key = (left, right)
+        node = cls._interned.get(key)
+        if node is None:
+            node = super().__new__(cls)
+            object.__setattr__(node, "left", left)
+            object.__setattr__(node, "right", right)
+            cls._interned[key] = node
+        return node
+
+    def __repr__(self) -> str:
+        return f"Add({self.left!r}, {self.right!r})"
+
+
+@overload
+def add(left: Literal, right: Literal) -> Literal:
+    ...
+
+
+@overload
+def add(left: Expression, right: Expression) -> Expression:
+    ...
+
+
+def add(left: Expression, right: Expression) -> Expression:
+    """Interned sum of `left` and `right`; `Literal + Literal` folds to a `Literal`.
+
+    Unlike `type_checking_variants.py`, the `Literal` variant comes first, so it is
+    not shadowed.
+    """
+    if isinstance(left, Literal):
+        if isinstance(right, Literal):
+            return Literal(left.value + right.value)
+        if left.value == 0:
+            return right
+    elif isinstance(right, Literal) and right.value == 0:
+        return left
+    return Add(left, right)
+
+
+def evaluate(expr: Expression, env: Mapping[str, int]) -> int:
+    """Value of `expr` with variables bound by `env`.
+
+    Each distinct node is evaluated once however many parents share it, and the
+    walk uses an explicit stack, so deep expressions do not hit the recursion limit.
+    """
+    values: Dict[Expression, int] = {}
+    stack: List[Expression] = [expr]
+    while stack:
+        node = stack[-1]
+        if node in values:
+            stack.pop()
+        elif isinstance(node, Add):
+            left, right = node.left, node.right
+            if left not in values:
+                stack.append(left)
+            elif right not in values:
+                stack.append(right)
+            else:
+                values[node] = values[left] + values[right]
+                stack.pop()
+        elif isinstance(node, Literal):
+            values[node] = node.value
+            stack.pop()
+        elif isinstance(node, Variable):
+            values[node] = env[node.name]
+            stack.pop()
+        else:
+            raise TypeError(f"Unknown expression node {node!r}")
+    return values[expr]
+
+
+def _walk(expr: Expression) -> List[Expression]:
+    """Distinct nodes of `expr`, children before parents."""
+    order: List[Expression] = []
+    done = set()
+    stack: List[Tuple[Expression, bool]] = [(expr, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if node in done:
+            continue
+        if expanded or not isinstance(node, Add):
+            done.add(node)
+            order.append(node)
+            continue
+        # Revisited once both children, pushed above it, are done
+        stack.append((node, True))
+        for child in (node.right, node.left):
+            if child not in done:
+                stack.append((child, False))
+    return order
+
+
+def dag_size(expr: Expression) -> int:
+    """Number of distinct nodes in `expr`."""
+    return len(_walk(expr))
+
+
+def tree_size(expr: Expression) -> int:
+    """Number of nodes `expr` would have with no sharing."""
+    sizes: Dict[Expression, int] = {}
+    for node in _walk(expr):
+        if isinstance(node, Add):
+            sizes[node] = 1 + sizes[node.left] + sizes[node.right]
+        else:
+            sizes[node] = 1
+    return sizes[expr]
+
+
+class _Sum:
+    """Plain tree node without interning or folding, for comparison."""
+
+    __slots__ = ("left", "right")
+
+    def __init__(self, left: object, right: object) -> None:
+        self.left = left
+        self.right = right
+
+
+def _evaluate_tree(node: object, env: Mapping[str, int]) -> int:
+    if isinstance(node, _Sum):
+        return _evaluate_tree(node.left, env) + _evaluate_tree(node.right, env)
+    if isinstance(node, str):
+        return env[node]
+    assert isinstance(node, int)
+    return node
+
+
+def benchmark(depth: int = 14) -> None:
+    """Generate and evaluate an expression `depth` levels deep, with and without
+    interning.
+
+    Level k is `level(k - 1) + level(k - 1) + k`, generated afresh for each
+    operand as a parser or code generator would, so the tree has about
+    3 * 2 ** depth nodes while only a handful of them are distinct.
+    """
+    env = {"x": 1}
+
+    def generate_dag(k: int) -> Expression:
+        if k == 0:
+            return Variable("x") + Literal(1) + Literal(2)
+        return generate_dag(k - 1) + generate_dag(k - 1) + Literal(k)
+
+    def generate_tree(k: int) -> object:
+        if k == 0:
+            return _Sum(_Sum("x", 1), 2)
+        return _Sum(_Sum(generate_tree(k - 1), generate_tree(k - 1)), k)
+
+    runs: List[Tuple[str, Callable[[], object], Callable[[Any], int]]] = [
+        ("DAG", lambda: generate_dag(depth), lambda expr: evaluate(expr, env)),
+        ("tree", lambda: generate_tree(depth), lambda expr: _evaluate_tree(expr, env)),
+    ]
+    for label, generate, run in runs:
+        tracemalloc.start()
+        expr = generate()
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        start = time.perf_counter()
+        value = run(expr)
+        elapsed = time.perf_counter() - start
+        print(
+            f"{label:<5} {memory:>12,} B  evaluate {elapsed * 1e3:9.3f} ms"
+            f"  value {value}"
+        )
+        del expr
+    dag = generate_dag(depth)
+    print(f"unique nodes {dag_size(dag):,}, tree nodes {tree_size(dag):,}")
+
+    # Far deeper than the recursion limit: evaluation is iterative
+    deep: Expression = Variable("x")
+    for k in range(100_000):
+        deep = deep + Variable(f"y{k % 10}")
+    start = time.perf_counter()
+    value = evaluate(deep, {"x": 1, **{f"y{k}": k for k in range(10)}})
+    elapsed = time.perf_counter() - start
+    print(f"chain of {dag_size(deep):,} nodes: {elapsed * 1e3:.1f} ms, value {value}")
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 14)
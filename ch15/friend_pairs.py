@@ -0,0 +1,59 @@
+"""Bulk construction of `Friend` pairs."""
+
+import sys
+import time
+from typing import Callable, List, Optional, Tuple, Type, TypeVar
+
+from bulk_constructors import gc_paused
+
+U = TypeVar("U", bound="Friend")
+
+
+class Friend:
+    """`Friend` of `ch14/generic_methods_self.py`, slotted."""
+
+    __slots__ = ("other",)
+
+    def __init__(self) -> None:
+        self.other: Optional[Friend] = None
+
+    @classmethod
+    def make_pair(cls: Type[U]) -> Tuple[U, U]:
+        a, b = cls(), cls()
+        a.other = b
+        b.other = a
+        return a, b
+
+    @classmethod
+    def make_pairs(cls: Type[U], count: int) -> List[Tuple[U, U]]:
+        """`[cls.make_pair() for _ in range(count)]`, with the cyclic GC paused.
+
+        Every pair is a reference cycle, so the collector would otherwise run
+        often and traverse the whole growing batch each time.
+        """
+        with gc_paused():
+            return [cls.make_pair() for _ in range(count)]
+
+
+class SuperFriend(Friend):
+    __slots__ = ()
+
+
+def benchmark(count: int = 500_000) -> None:
+    """Compare `make_pairs` with calling `make_pair` in a comprehension."""
+    runs: List[Tuple[str, Callable[[], List[Tuple[SuperFriend, SuperFriend]]]]] = [
+        ("comprehension", lambda: [SuperFriend.make_pair() for _ in range(count)]),
+        ("make_pairs", lambda: SuperFriend.make_pairs(count)),
+    ]
+    for label, run in runs:
+        start = time.perf_counter()
+        pairs = run()
+        elapsed = time.perf_counter() - start
+        a, b = pairs[-1]
+        assert a.other is b and b.other is a
+        del pairs, a, b
+        print(f"{label:<14} {count / elapsed:14,.0f} pairs/s")
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 500_000)
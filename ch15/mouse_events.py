@@ -0,0 +1,243 @@
+"""Slotted, pooled mouse events with bulk construction."""
+
+import sys
+import time
+import tracemalloc
+from array import array
+from typing import (
+    Any,
+    Callable,
+    Generic,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Set,
+    Type,
+    TypeVar,
+    Union,
+    overload,
+)
+
+
+class ClickEvent:
+    __slots__ = ("x1", "y1")
+
+    def __init__(self, x1: int, y1: int) -> None:
+        self.x1 = x1
+        self.y1 = y1
+
+    def __repr__(self) -> str:
+        return f"ClickEvent({self.x1}, {self.y1})"
+
+
+class DragEvent:
+    __slots__ = ("x1", "y1", "x2", "y2")
+
+    def __init__(self, x1: int, y1: int, x2: int, y2: int) -> None:
+        self.x1 = x1
+        self.y1 = y1
+        self.x2 = x2
+        self.y2 = y2
+
+    def __repr__(self) -> str:
+        return f"DragEvent({self.x1}, {self.y1}, {self.x2}, {self.y2})"
+
+
+E = TypeVar("E", ClickEvent, DragEvent)
+
+
+class EventPool(Generic[E]):
+    """Free list of released events of one class, reused instead of allocating.
+
+    Only release events that nothing else refers to any more: a reused event is
+    overwritten in place. Releasing an event that is already pooled raises
+    `ValueError`, since it would later be handed out twice.
+    """
+
+    def __init__(self, event_class: Type[E], max_size: int = 65536) -> None:
+        self.event_class: Type[E] = event_class
+        self.max_size = max_size
+        self.allocated = 0
+        self.reused = 0
+        self._free: List[E] = []
+        # ids of the events in `_free`
+        self._pooled: Set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self._free)
+
+    def acquire(self, *coords: int) -> E:
+        if self._free:
+            event = self._free.pop()
+            self._pooled.remove(id(event))
+            event.__init__(*coords)  # type: ignore[misc]
+            self.reused += 1
+            return event
+        self.allocated += 1
+        event = self.event_class(*coords)
+        return event
+
+    def acquire_many(self, *columns: Sequence[int]) -> List[E]:
+        """Build one event per row of the coordinate columns, reusing pooled ones."""
+        count = len(columns[0])
+        free = self._free
+        reuse = min(count, len(free))
+        if reuse:
+            events = free[len(free) - reuse :]
+            del free[len(free) - reuse :]
+            self._pooled.difference_update(map(id, events))
+            init = self.event_class.__init__
+            for event, *coords in zip(events, *(column[:reuse] for column in columns)):
+                init(event, *coords)
+            self.reused += reuse
+        else:
+            events = []
+        if reuse < count:
+            # map() drives the constructor from C, one call per row
+            events.extend(
+                map(self.event_class, *(column[reuse:] for column in columns))
+            )
+            self.allocated += count - reuse
+        return events
+
+    def release(self, event: E) -> None:
+        key = id(event)
+        if key in self._pooled:
+            raise ValueError(f"{event!r} was already released")
+        if len(self._free) < self.max_size:
+            self._free.append(event)
+            self._pooled.add(key)
+
+    def release_many(self, events: Sequence[E]) -> None:
+        """Release every event, or none if any of them is already pooled."""
+        keys = list(map(id, events))
+        if len(set(keys)) < len(keys) or not self._pooled.isdisjoint(keys):
+            raise ValueError("an event was released twice")
+        room = max(self.max_size - len(self._free), 0)
+        self._free.extend(events[:room])
+        self._pooled.update(keys[:room])
+
+
+click_pool = EventPool(ClickEvent)
+drag_pool = EventPool(DragEvent)
+
+
+@overload
+def mouse_event(x1: int, y1: int) -> ClickEvent:
+    ...
+
+
+@overload
+def mouse_event(x1: int, y1: int, x2: int, y2: int) -> DragEvent:
+    ...
+
+
+def mouse_event(
+    x1: int, y1: int, x2: Optional[int] = None, y2: Optional[int] = None
+) -> Union[ClickEvent, DragEvent]:
+    """Same contract as `mouse_event` in `function_overloading.py`, using the pools."""
+    if x2 is None and y2 is None:
+        return click_pool.acquire(x1, y1)
+    elif x2 is not None and y2 is not None:
+        return drag_pool.acquire(x1, y1, x2, y2)
+    else:
+        raise TypeError("Bad arguments")
+
+
+@overload
+def mouse_events(coords: Sequence[int], width: Literal[2]) -> List[ClickEvent]:
+    ...
+
+
+@overload
+def mouse_events(coords: Sequence[int], width: Literal[4]) -> List[DragEvent]:
+    ...
+
+
+@overload
+def mouse_events(
+    coords: Union[Sequence[int], memoryview], width: Optional[int] = None
+) -> Union[List[ClickEvent], List[DragEvent]]:
+    ...
+
+
+def mouse_events(
+    coords: Union[Sequence[int], memoryview], width: Optional[int] = None
+) -> Union[List[ClickEvent], List[DragEvent]]:
+    """Build events from an (n, 2) or (n, 4) coordinate buffer in one call.
+
+    `coords` is either a flat, row-major sequence (a list, `array` or 1-d
+    `memoryview`) together with `width`, or a 2-d `memoryview` whose second
+    dimension gives the width. Width 2 yields `ClickEvent`s and width 4 yields
+    `DragEvent`s.
+    """
+    if isinstance(coords, memoryview) and coords.ndim == 2:
+        assert coords.shape is not None
+        if width is not None and width != coords.shape[1]:
+            raise ValueError("width does not match the buffer shape")
+        width = coords.shape[1]
+        fmt: Any = coords.format
+        coords = coords.cast("B").cast(fmt)
+    if width not in (2, 4):
+        raise ValueError("width must be 2 (clicks) or 4 (drags)")
+    if len(coords) % width:
+        raise ValueError(f"buffer length is not a multiple of {width}")
+    columns = [coords[i::width] for i in range(width)]
+    if width == 2:
+        return click_pool.acquire_many(*columns)
+    return drag_pool.acquire_many(*columns)
+
+
+class DictClickEvent:
+    """`ClickEvent` as in `function_overloading.py`, with a per-instance dict."""
+
+    def __init__(self, x1: int, y1: int) -> None:
+        self.x1 = x1
+        self.y1 = y1
+
+
+def benchmark(n: int = 500_000) -> None:
+    """Compare allocations and throughput of per-call, bulk and pooled clicks."""
+    # Small ints are cached by CPython, so new blocks are the events themselves
+    coords = array("q", (i % 256 for i in range(2 * n)))
+    xs, ys = coords[0::2], coords[1::2]
+    click_pool.max_size = n
+
+    def refill_pool() -> None:
+        click_pool.release_many(mouse_events(coords, 2))
+
+    def report(
+        label: str, run: Callable[[], List[object]], setup: Callable[[], None]
+    ) -> None:
+        setup()
+        start = time.perf_counter()
+        events = run()
+        elapsed = time.perf_counter() - start
+        assert len(events) == n
+        del events
+        setup()
+        tracemalloc.start()
+        events = run()
+        blocks = len(tracemalloc.take_snapshot().traces)
+        tracemalloc.stop()
+        del events
+        rate = n / elapsed
+        print(f"{label:<22} {rate:14,.0f} events/s {blocks:10,} new blocks")
+
+    def nothing() -> None:
+        pass
+
+    report("dict class, per call", lambda: list(map(DictClickEvent, xs, ys)), nothing)
+    report(
+        "slotted, per call",
+        lambda: [mouse_event(x, y) for x, y in zip(xs, ys)],
+        nothing,
+    )
+    report("slotted, bulk", lambda: list(mouse_events(coords, 2)), nothing)
+    report("pooled, bulk", lambda: list(mouse_events(coords, 2)), refill_pool)
+    print(f"pool: {click_pool.allocated:,} allocated, {click_pool.reused:,} reused")
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 500_000)
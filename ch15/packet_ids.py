@@ -0,0 +1,218 @@
+"""Packed 64-bit `PacketId`s with bulk parsing from capture buffers."""
+
+import os
+import struct
+import sys
+import time
+from array import array
+from operator import itemgetter
+from typing import (
+    Iterable,
+    Iterator,
+    List,
+    NewType,
+    Union,
+    overload,
+)
+
+MASK_32 = (1 << 32) - 1
+# `(major, minor)` as two big-endian 32-bit unsigned ints on the wire is also the
+# packed key as one big-endian 64-bit int
+WIRE_FORMAT = "!Q"
+
+
+class PacketId(int):
+    """Packet ID packed into one int as `major << 32 | minor`.
+
+    Being an `int`, it is immutable and hashes, compares and sorts in C, in
+    `(major, minor)` order. It also compares equal to its plain packed int.
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, major: int, minor: int) -> "PacketId":
+        if not (0 <= major <= MASK_32 and 0 <= minor <= MASK_32):
+            raise ValueError("major and minor must be unsigned 32-bit ints")
+        return int.__new__(cls, major << 32 | minor)
+
+    @classmethod
+    def from_key(cls, key: int) -> "PacketId":
+        return int.__new__(cls, key)
+
+    @property
+    def key(self) -> int:
+        return int(self)
+
+    @property
+    def major(self) -> int:
+        return self >> 32
+
+    @property
+    def minor(self) -> int:
+        return self & MASK_32
+
+    def __repr__(self) -> str:
+        return f"PacketId({self.major}, {self.minor})"
+
+
+TcpPacketId = NewType("TcpPacketId", PacketId)
+
+
+def parse_keys(
+    buffer: Union[bytes, bytearray, memoryview], offset: int = 0, stride: int = 8
+) -> "array[int]":
+    """Packed keys of the IDs in a capture `buffer`, as an `array` of `"Q"`.
+
+    Record `i` starts at `offset + i * stride` and begins with the ID's major and
+    minor as big-endian 32-bit ints; the rest of the record is skipped, and so is a
+    trailing fragment too short to hold an ID. Densely packed IDs are copied and
+    byte-swapped in bulk; strided ones are unpacked by `struct` in one C loop.
+    """
+    if stride < 8:
+        raise ValueError("stride must be at least 8")
+    view = memoryview(buffer)[offset:]
+    count = (len(view) - 8) // stride + 1 if len(view) >= 8 else 0
+    if stride == 8:
+        keys = array("Q")
+        keys.frombytes(view[: count * 8])
+        if sys.byteorder == "little":
+            keys.byteswap()
+        return keys
+    size = count * stride
+    # Pad a last record that holds an ID but not the whole stride
+    data = view[:size] if len(view) >= size else bytes(view) + bytes(size - len(view))
+    record = struct.Struct(f"{WIRE_FORMAT}{stride - 8}x")
+    return array("Q", map(itemgetter(0), record.iter_unpack(data)))
+
+
+class TcpPacketIds:
+    """Typed array of `TcpPacketId`s, stored as packed keys.
+
+    The keys take 8 bytes per ID instead of an object each, and `sort` and `dedup`
+    run on them directly; `PacketId`s are built only when items are read.
+    """
+
+    def __init__(self, keys: Iterable[int] = ()) -> None:
+        self.keys: "array[int]" = keys if isinstance(keys, array) else array("Q", keys)
+
+    @classmethod
+    def from_ids(cls, ids: Iterable[PacketId]) -> "TcpPacketIds":
+        return cls(ids)
+
+    @classmethod
+    def from_buffer(
+        cls,
+        buffer: Union[bytes, bytearray, memoryview],
+        offset: int = 0,
+        stride: int = 8,
+    ) -> "TcpPacketIds":
+        """Parse IDs from a capture buffer, see `parse_keys`."""
+        return cls(parse_keys(buffer, offset, stride))
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @overload
+    def __getitem__(self, index: int) -> TcpPacketId:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "TcpPacketIds":
+        ...
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[TcpPacketId, "TcpPacketIds"]:
+        if isinstance(index, slice):
+            return TcpPacketIds(self.keys[index])
+        return TcpPacketId(PacketId.from_key(self.keys[index]))
+
+    def __iter__(self) -> Iterator[TcpPacketId]:
+        for key in self.keys:
+            yield TcpPacketId(PacketId.from_key(key))
+
+    def __contains__(self, packet_id: object) -> bool:
+        return isinstance(packet_id, PacketId) and packet_id in self.keys
+
+    def append(self, packet_id: TcpPacketId) -> None:
+        self.keys.append(packet_id)
+
+    def sort(self) -> None:
+        self.keys = array("Q", sorted(self.keys))
+
+    def dedup(self) -> None:
+        """Drop repeated IDs, keeping the first occurrence of each."""
+        self.keys = array("Q", dict.fromkeys(self.keys))
+
+    def to_bytes(self) -> bytes:
+        """The IDs in wire format, as `parse_keys` reads them."""
+        keys = array("Q", self.keys)
+        if sys.byteorder == "little":
+            keys.byteswap()
+        return keys.tobytes()
+
+
+class DictPacketId:
+    """`PacketId` as in `newtypes.py`, ordered and hashed by an attribute tuple."""
+
+    def __init__(self, major: int, minor: int) -> None:
+        self._major = major
+        self._minor = minor
+
+    def __hash__(self) -> int:
+        return hash((self._major, self._minor))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, DictPacketId):
+            return NotImplemented
+        return (self._major, self._minor) == (other._major, other._minor)
+
+    def __lt__(self, other: "DictPacketId") -> bool:
+        return (self._major, self._minor) < (other._major, other._minor)
+
+
+def benchmark(n: int = 1_000_000) -> None:
+    """Parse, dedup and sort `n` IDs from a capture buffer, three ways."""
+    # Half the IDs are repeats
+    keys = array("Q", os.urandom(n // 2 * 8))
+    keys.extend(array("Q", keys))
+    capture = TcpPacketIds(keys).to_bytes()
+
+    def dict_per_record() -> List[DictPacketId]:
+        unpack = struct.Struct("!II").unpack_from
+        return [DictPacketId(*unpack(capture, i)) for i in range(0, len(capture), 8)]
+
+    def packed_per_record() -> List[PacketId]:
+        from_key = PacketId.from_key
+        return [from_key(key) for (key,) in struct.iter_unpack(WIRE_FORMAT, capture)]
+
+    start = time.perf_counter()
+    dict_ids = dict_per_record()
+    parsed = time.perf_counter() - start
+    start = time.perf_counter()
+    dict_ids = sorted(set(dict_ids))
+    deduped = time.perf_counter() - start
+    print(f"dict attributes  parse {parsed:7.3f} s  dedup+sort {deduped:7.3f} s")
+
+    start = time.perf_counter()
+    packed_ids = packed_per_record()
+    parsed = time.perf_counter() - start
+    start = time.perf_counter()
+    packed_ids = sorted(set(packed_ids))
+    deduped = time.perf_counter() - start
+    print(f"packed objects   parse {parsed:7.3f} s  dedup+sort {deduped:7.3f} s")
+
+    start = time.perf_counter()
+    ids = TcpPacketIds.from_buffer(capture)
+    parsed = time.perf_counter() - start
+    start = time.perf_counter()
+    ids.dedup()
+    ids.sort()
+    deduped = time.perf_counter() - start
+    print(f"typed array      parse {parsed:7.3f} s  dedup+sort {deduped:7.3f} s")
+    assert len(ids) == len(packed_ids) == len(dict_ids)
+    assert ids[0] == packed_ids[0] and ids[-1] == packed_ids[-1]
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
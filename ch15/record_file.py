@@ -0,0 +1,307 @@
+"""A memory-mapped binary file format for `TypedDict` records.
+
+Layout::
+
+    magic | column 0 | ... | column n | string heap | footer | footer size | magic
+
+Every column is a fixed-width array of `rows` values, aligned to 8 bytes. `str`
+columns hold `rows + 1` offsets into the string heap, so value `i` is the UTF-8
+slice between offsets `i` and `i + 1`. Optional keys also get a column of validity
+bytes. The JSON footer describes where each column lives, so opening a file only reads
+its tail and does not depend on the number of rows.
+"""
+
+import json
+import mmap
+import os
+import sys
+import tempfile
+import time
+from array import array
+from types import TracebackType
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Type,
+    TypedDict,
+    Union,
+    get_type_hints,
+    overload,
+)
+
+Movie = TypedDict("Movie", {"name": str, "year": int})
+
+MAGIC = b"TDREC001"
+TYPECODES: Dict[str, str] = {"int": "q", "float": "d", "bool": "B", "str": "Q"}
+KINDS: Dict[type, str] = {int: "int", float: "float", bool: "bool", str: "str"}
+
+
+class RecordFileError(ValueError):
+    """Raised when a file is not a valid record file."""
+
+
+def _pad(out: IO[bytes]) -> None:
+    out.write(b"\0" * (-out.tell() % 8))
+
+
+def write_records(
+    path: str, schema: Callable[..., Mapping[str, object]], records: Iterable[Any]
+) -> int:
+    """Write `records` of the `TypedDict` `schema` to `path`; return the row count."""
+    hints = get_type_hints(schema)
+    optional: FrozenSet[str] = getattr(schema, "__optional_keys__", frozenset())
+    kinds: Dict[str, str] = {}
+    for key, tp in hints.items():
+        if tp not in KINDS:
+            raise TypeError(f"unsupported type {tp!r} for key {key!r}")
+        kinds[key] = KINDS[tp]
+
+    values = {key: array(TYPECODES[kind]) for key, kind in kinds.items()}
+    valid = {key: bytearray() for key in kinds if key in optional}
+    heap = bytearray()
+    for column in values.values():
+        if column.typecode == "Q":
+            column.append(0)
+    rows = 0
+    for record in records:
+        for key, kind in kinds.items():
+            present = key in record
+            if key in valid:
+                valid[key].append(present)
+            elif not present:
+                raise RecordFileError(f"row {rows}: missing required key {key!r}")
+            if kind == "str":
+                if present:
+                    heap += record[key].encode("utf-8")
+                values[key].append(len(heap))
+            else:
+                values[key].append(record[key] if present else 0)
+        rows += 1
+
+    columns: List[Dict[str, Any]] = []
+    with open(path, "wb") as out:
+        out.write(MAGIC)
+        for key, kind in kinds.items():
+            entry: Dict[str, Any] = {"name": key, "kind": kind, "offset": out.tell()}
+            values[key].tofile(out)
+            _pad(out)
+            if key in valid:
+                entry["valid"] = out.tell()
+                out.write(valid[key])
+                _pad(out)
+            columns.append(entry)
+        heap_offset = out.tell()
+        out.write(heap)
+        footer = json.dumps(
+            {
+                "rows": rows,
+                "byteorder": sys.byteorder,
+                "heap": heap_offset,
+                "columns": columns,
+            }
+        ).encode("utf-8")
+        out.write(footer)
+        out.write(len(footer).to_bytes(8, "little"))
+        out.write(MAGIC)
+    return rows
+
+
+class StrColumn(Sequence[str]):
+    """Lazily decoded view of a `str` column."""
+
+    def __init__(self, offsets: memoryview, heap: memoryview) -> None:
+        self._offsets = offsets
+        self._heap = heap
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    @overload
+    def __getitem__(self, index: int) -> str:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[str]:
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[str, List[str]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("column index out of range")
+        start, end = self._offsets[index], self._offsets[index + 1]
+        return str(self._heap[start:end], "utf-8")
+
+    def raw(self, index: int) -> memoryview:
+        """Return the undecoded UTF-8 bytes of one value without copying."""
+        return self._heap[self._offsets[index] : self._offsets[index + 1]]
+
+
+class RecordFile:
+    """Read-only, memory-mapped access to a file written by `write_records`.
+
+    Columns are views straight into the mapping and rows are decoded on access.
+    Column views handed out before `close` keep the mapping alive until dropped.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._file = open(path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise RecordFileError(f"{path}: empty file") from None
+        self._view = memoryview(self._mmap)
+        try:
+            self._read_footer(path)
+        except BaseException:
+            self.close()
+            raise
+        self._columns: Dict[str, Sequence[Any]] = {}
+        self._valid: Dict[str, memoryview] = {}
+
+    def _read_footer(self, path: str) -> None:
+        view = self._view
+        size = len(view)
+        if size < 24 or view[:8] != MAGIC or view[size - 8 :] != MAGIC:
+            raise RecordFileError(f"{path}: not a record file")
+        footer_size = int.from_bytes(view[size - 16 : size - 8], "little")
+        footer = json.loads(bytes(view[size - 16 - footer_size : size - 16]))
+        if footer["byteorder"] != sys.byteorder:
+            raise RecordFileError(f"{path}: written with {footer['byteorder']} endian")
+        self.rows: int = footer["rows"]
+        self._heap_offset: int = footer["heap"]
+        self._heap_end = size - 16 - footer_size
+        self._layout: Dict[str, Dict[str, Any]] = {
+            column["name"]: column for column in footer["columns"]
+        }
+
+    def __enter__(self) -> "RecordFile":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._columns = {}
+        self._valid = {}
+        self._view.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            # Column views are still alive; the mapping goes away with the last one
+            pass
+        self._file.close()
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def keys(self) -> List[str]:
+        return list(self._layout)
+
+    def column(self, key: str) -> Sequence[Any]:
+        """Return a column as a view into the file; nothing is read until indexed."""
+        column = self._columns.get(key)
+        if column is None:
+            layout = self._layout[key]
+            kind = layout["kind"]
+            typecode = TYPECODES[kind]
+            count = self.rows + 1 if kind == "str" else self.rows
+            start = layout["offset"]
+            end = start + count * array(typecode).itemsize
+            # Booleans are stored as bytes and read back through the "?" format
+            fmt: Any = "?" if kind == "bool" else typecode
+            values = self._view[start:end].cast(fmt)
+            if kind == "str":
+                heap = self._view[self._heap_offset : self._heap_end]
+                column = StrColumn(values, heap)
+            else:
+                column = values
+            self._columns[key] = column
+        return column
+
+    def valid(self, key: str) -> Optional[memoryview]:
+        """Return the validity bytes of an optional column, or `None` if required."""
+        layout = self._layout[key]
+        if "valid" not in layout:
+            return None
+        mask = self._valid.get(key)
+        if mask is None:
+            start = layout["valid"]
+            mask = self._view[start : start + self.rows]
+            self._valid[key] = mask
+        return mask
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        if index < 0:
+            index += self.rows
+        if not 0 <= index < self.rows:
+            raise IndexError("row index out of range")
+        row: Dict[str, Any] = {}
+        for key in self._layout:
+            mask = self.valid(key)
+            if mask is None or mask[index]:
+                row[key] = self.column(key)[index]
+        return row
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(self.rows):
+            yield self[i]
+
+
+def benchmark(n: int = 1_000_000) -> None:
+    """Compare cold start and a full column scan of `json` and a record file."""
+    movies: List[Movie] = [
+        {"name": f"Movie {i}", "year": 1900 + i % 120} for i in range(n)
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "movies.json")
+        rec_path = os.path.join(tmp, "movies.rec")
+        with open(json_path, "w") as out:
+            json.dump(movies, out)
+        write_records(rec_path, Movie, movies)
+        del movies
+
+        start = time.perf_counter()
+        with open(json_path) as src:
+            loaded = json.load(src)
+        json_open = time.perf_counter() - start
+        start = time.perf_counter()
+        json_total = sum(movie["year"] for movie in loaded)
+        json_scan = time.perf_counter() - start
+        del loaded
+
+        start = time.perf_counter()
+        records = RecordFile(rec_path)
+        first = records[n // 2]
+        rec_open = time.perf_counter() - start
+        start = time.perf_counter()
+        years = records.column("year")
+        rec_total = sum(years)
+        rec_scan = time.perf_counter() - start
+        del years
+        records.close()
+        assert rec_total == json_total and first["name"] == f"Movie {n // 2}"
+
+    print(f"json:        open {json_open:8.4f} s, scan year {json_scan:8.4f} s")
+    print(f"record file: open {rec_open:8.4f} s, scan year {rec_scan:8.4f} s")
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
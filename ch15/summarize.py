@@ -0,0 +1,144 @@
+"""Implementations of the overloaded `summarize`."""
+
+import os
+import sys
+import time
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, List, Optional, Sequence, Tuple, Union, overload
+
+# Inputs at least this long are split into chunks for a process pool
+PARALLEL_THRESHOLD = 10_000_000
+
+
+class StrStats:
+    """Mergeable frequency and length statistics of a run of strings."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_length = 0
+        self.min_length: Optional[int] = None
+        self.max_length: Optional[int] = None
+        self.frequencies: "Counter[str]" = Counter()
+
+    @classmethod
+    def of(cls, data: Sequence[str], block: int = 1 << 20) -> "StrStats":
+        """Collect statistics block by block, so temporaries stay small."""
+        stats = cls()
+        stats.frequencies = Counter(data)
+        stats.count = len(data)
+        for start in range(0, len(data), block):
+            lengths = array("q", map(len, data[start : start + block]))
+            stats.total_length += sum(lengths)
+            low, high = min(lengths), max(lengths)
+            if stats.min_length is None or low < stats.min_length:
+                stats.min_length = low
+            if stats.max_length is None or high > stats.max_length:
+                stats.max_length = high
+        return stats
+
+    def merge(self, other: "StrStats") -> "StrStats":
+        self.count += other.count
+        self.total_length += other.total_length
+        for attr, pick in (("min_length", min), ("max_length", max)):
+            mine, theirs = getattr(self, attr), getattr(other, attr)
+            if theirs is not None:
+                setattr(self, attr, theirs if mine is None else pick(mine, theirs))
+        self.frequencies.update(other.frequencies)
+        return self
+
+    def __str__(self) -> str:
+        if not self.count:
+            return "0 strings"
+        ((common, times),) = self.frequencies.most_common(1)
+        return (
+            f"{self.count} strings, {len(self.frequencies)} distinct, "
+            f"length min/mean/max {self.min_length}/"
+            f"{self.total_length / self.count:.2f}/{self.max_length}, "
+            f"most common {common!r} x{times}"
+        )
+
+
+def _int_partial(data: Sequence[int]) -> Tuple[int, int]:
+    return len(data), sum(data)
+
+
+def _chunks(data: Sequence[Any], workers: int) -> List[Sequence[Any]]:
+    size = -(-len(data) // workers)
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+def summarize_ints(
+    data: Sequence[int],
+    workers: Optional[int] = None,
+    threshold: int = PARALLEL_THRESHOLD,
+) -> float:
+    """Mean of `data`.
+
+    `sum` over a list or `array` runs as a single C loop, which is faster than
+    shipping the values to other processes, so large inputs are only split across
+    a pool when they are already packed in an `array` (cheap to pickle).
+    """
+    if not data:
+        return 0.0
+    workers = workers or os.cpu_count() or 1
+    if isinstance(data, array) and len(data) >= threshold and workers > 1:
+        with ProcessPoolExecutor(workers) as pool:
+            partials = list(pool.map(_int_partial, _chunks(data, workers)))
+        return sum(total for _, total in partials) / len(data)
+    return sum(data) / len(data)
+
+
+def summarize_strs(
+    data: Sequence[str],
+    workers: Optional[int] = None,
+    threshold: int = PARALLEL_THRESHOLD,
+) -> str:
+    """Frequency and length statistics of `data`, as a one-line report."""
+    workers = workers or os.cpu_count() or 1
+    if len(data) < threshold or workers == 1:
+        return str(StrStats.of(data))
+    stats = StrStats()
+    with ProcessPoolExecutor(workers) as pool:
+        for partial in pool.map(StrStats.of, _chunks(data, workers * 4)):
+            stats.merge(partial)
+    return str(stats)
+
+
+@overload
+def summarize(data: List[int]) -> float:
+    ...
+
+
+@overload
+def summarize(data: List[str]) -> str:
+    ...
+
+
+def summarize(data: Union[List[int], List[str]]) -> Union[float, str]:
+    if not data:
+        return 0.0
+    elif isinstance(data[0], int):
+        return summarize_ints(data)
+    else:
+        return summarize_strs(data)
+
+
+def benchmark(n: int = 10_000_000) -> None:
+    """Time `summarize` on `n` ints and `n` strings."""
+    ints = list(range(n))
+    start = time.perf_counter()
+    mean = summarize(ints)
+    print(f"{n:,} ints:    {time.perf_counter() - start:6.2f} s  mean {mean}")
+    del ints
+
+    words = ["alpha", "beta", "gamma", "delta", "epsilon"]
+    strs = [words[i % 5] for i in range(n)]
+    start = time.perf_counter()
+    report = summarize(strs)
+    print(f"{n:,} strings: {time.perf_counter() - start:6.2f} s  {report}")
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000)
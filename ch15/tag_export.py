@@ -0,0 +1,102 @@
+"""Batch export of `Tag[T]` with converter result caching."""
+
+import sys
+import time
+from functools import lru_cache
+from operator import attrgetter
+from typing import Callable, Generic, List, Optional, Sequence, Tuple, TypeVar, overload
+
+T = TypeVar("T")
+
+
+class Tag(Generic[T]):
+    """`Tag` of `restricted_methods_generic.py`, with a constructor."""
+
+    __slots__ = ("item",)
+
+    def __init__(self, item: T) -> None:
+        self.item = item
+
+    @overload
+    def export(self: "Tag[str]") -> str:
+        ...
+
+    @overload
+    def export(self, converter: Callable[[T], str]) -> str:
+        ...
+
+    def export(self, converter: Optional[Callable[[T], str]] = None) -> str:
+        if isinstance(self.item, str):
+            return self.item
+        assert converter is not None
+        return converter(self.item)
+
+
+_get_items = attrgetter("item")
+
+
+@overload
+def export_many(tags: Sequence[Tag[str]]) -> List[str]:
+    ...
+
+
+@overload
+def export_many(
+    tags: Sequence[Tag[T]], converter: Callable[[T], str], cache_size: int = ...
+) -> List[str]:
+    ...
+
+
+def export_many(
+    tags: Sequence[Tag[T]],
+    converter: Optional[Callable[[T], str]] = None,
+    cache_size: int = 0,
+) -> List[str]:
+    """`[tag.export(converter) for tag in tags]`, deciding how to convert once.
+
+    The item types are inspected once for the whole batch: an all-`str` batch is
+    returned without calling anything, a batch without `str` items is mapped
+    straight through `converter`, and only a mixed batch is checked item by item.
+    With a positive `cache_size`, converter results are memoized in an LRU cache of
+    that many entries for the duration of the call, which pays off when items
+    repeat; the items must then be hashable.
+    """
+    items: List[T] = list(map(_get_items, tags))
+    types = set(map(type, items))
+    if types <= {str}:
+        return items  # type: ignore[return-value]
+    if converter is None:
+        raise TypeError("a converter is needed for items that are not str")
+    convert = lru_cache(cache_size)(converter) if cache_size > 0 else converter
+    if not any(issubclass(cls, str) for cls in types):
+        return list(map(convert, items))
+    return [item if isinstance(item, str) else convert(item) for item in items]
+
+
+def benchmark(n: int = 1_000_000, distinct: int = 100) -> None:
+    """Compare per-tag `export` with `export_many`, uncached and cached."""
+
+    def converter(value: float) -> str:
+        return f"{value:,.3f}"
+
+    floats = [Tag(float(i % distinct) * 1.5) for i in range(n)]
+    strs = [Tag(f"item {i % distinct}") for i in range(n)]
+    runs: List[Tuple[str, Callable[[], List[str]]]] = [
+        ("export, str", lambda: [tag.export() for tag in strs]),
+        ("export_many, str", lambda: export_many(strs)),
+        ("export, float", lambda: [tag.export(converter) for tag in floats]),
+        ("export_many, float", lambda: export_many(floats, converter)),
+        (
+            "export_many, cached",
+            lambda: export_many(floats, converter, cache_size=distinct),
+        ),
+    ]
+    for label, run in runs:
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        print(f"{label:<20} {n / elapsed:14,.0f} tags/s")
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
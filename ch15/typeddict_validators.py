@@ -0,0 +1,492 @@
+"""Runtime validators compiled from `TypedDict` definitions."""
+
+import sys
+import time
+from collections import abc
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Literal,
+    Mapping,
+    Optional,
+    Tuple,
+    TypedDict,
+    Union,
+    get_args,
+    get_origin,
+    get_type_hints,
+)
+
+Movie = TypedDict("Movie", {"name": str, "year": int})
+GuiOptions = TypedDict("GuiOptions", {"language": str, "color": str}, total=False)
+
+
+class MyDict(TypedDict):
+    name: str
+    main_id: int
+    backup_id: int
+
+
+class NewJobEvent(TypedDict):
+    tag: Literal["new-job"]
+    job_name: str
+    config_file_path: str
+
+
+ExtraKeys = Literal["reject", "strip"]
+Record = Dict[str, Any]
+
+
+class ValidationError(ValueError):
+    """Raised when a record does not match its `TypedDict` schema."""
+
+    def __init__(self, message: str, path: str = "") -> None:
+        super().__init__(f"{path}: {message}" if path else message)
+        self.path = path
+
+
+def is_typeddict(tp: object) -> bool:
+    return isinstance(tp, type) and hasattr(tp, "__required_keys__")
+
+
+class CompiledValidator:
+    """Validation functions generated for one `TypedDict`.
+
+    Calling the validator checks a single record; `batch` checks a whole iterable
+    with the same per-key code inlined in its loop. Both return the validated
+    records: the input objects themselves when unknown keys are rejected, or new
+    dicts holding only the declared keys when they are stripped.
+    """
+
+    def __init__(
+        self,
+        schema: type,
+        validate: Callable[[object], Record],
+        batch: Callable[[Iterable[object]], List[Record]],
+        source: str,
+    ) -> None:
+        self.schema = schema
+        self.validate = validate
+        self.batch = batch
+        self.source = source
+
+    def __call__(self, record: object) -> Record:
+        return self.validate(record)
+
+
+class _Compiler:
+    def __init__(self, extra: ExtraKeys) -> None:
+        if extra not in ("reject", "strip"):
+            raise ValueError(f"extra must be 'reject' or 'strip', not {extra!r}")
+        self.extra = extra
+        self.namespace: Dict[str, Any] = {"ValidationError": ValidationError}
+        self.nested: Dict[type, str] = {}
+        self._counter = 0
+
+    def constant(self, value: object) -> str:
+        """Bind `value` to a fresh global name in the generated code."""
+        name = f"_c{self._counter}"
+        self._counter += 1
+        self.namespace[name] = value
+        return name
+
+    def simple_check(self, tp: Any, var: str) -> Optional[str]:
+        """Return a boolean expression checking `var` against `tp`, if one exists.
+
+        `None` means either "no check needed" (`Any`, `object`) or that `tp` needs
+        statements rather than an expression; `needs_statements` tells them apart.
+        """
+        if tp is Any or tp is object:
+            return None
+        if tp is type(None):
+            return f"{var} is None"
+        if tp is float:
+            return f"isinstance({var}, {self.constant((int, float))})"
+        origin = get_origin(tp)
+        if origin is Literal:
+            return f"{var} in {self.constant(frozenset(get_args(tp)))}"
+        if origin is Union:
+            parts = [self.simple_check(arg, var) for arg in get_args(tp)]
+            if any(part is None for part in parts):
+                return None
+            return " or ".join(f"({part})" for part in parts)
+        if isinstance(tp, type) and not is_typeddict(tp):
+            return f"isinstance({var}, {self.constant(tp)})"
+        return None
+
+    def needs_statements(self, tp: Any) -> bool:
+        origin = get_origin(tp)
+        if origin is Union:
+            return any(self.needs_statements(arg) for arg in get_args(tp))
+        return is_typeddict(tp) or origin in (list, abc.Sequence)
+
+    def shallow_check(self, tp: Any, var: str) -> Optional[str]:
+        """`simple_check`, falling back to the classes a generic `tp` erases to."""
+        check = self.simple_check(tp, var)
+        if check is None and get_origin(tp) is not None and tp is not Any:
+            # Other generics (Dict[...], unions of containers) only get a shallow
+            # check against the classes they erase to
+            erased = self.erased(tp)
+            if erased is not object:
+                check = f"isinstance({var}, {self.constant(erased)})"
+        return check
+
+    def container(self, tp: Any) -> object:
+        """The classes a value of `tp`, which needs statements, must be one of."""
+        if is_typeddict(tp):
+            return dict
+        return list if get_origin(tp) is list else (list, tuple)
+
+    def erased(self, tp: Any) -> Any:
+        """Return the runtime class a (possibly generic) type erases to."""
+        if is_typeddict(tp):
+            return dict
+        if tp is type(None):
+            return tp
+        origin = get_origin(tp)
+        if origin is Union:
+            return tuple(self.erased(arg) for arg in get_args(tp))
+        if origin is Literal:
+            return tuple({type(arg) for arg in get_args(tp)})
+        if isinstance(origin, type):
+            return origin
+        return tp if isinstance(tp, type) else object
+
+    def emit_value(
+        self, lines: List[str], indent: str, tp: Any, var: str, path: str
+    ) -> str:
+        """Emit statements validating `var`; return the name holding its result."""
+        origin = get_origin(tp)
+        if is_typeddict(tp):
+            nested = self.nested_validator(tp)
+            lines.append(f"{indent}{var} = {nested}({var}, {path})")
+            return var
+        if origin is Union and self.needs_statements(tp):
+            self.emit_union(lines, indent, tp, var, path)
+            return var
+        if origin in (list, abc.Sequence):
+            (item_tp,) = get_args(tp) or (Any,)
+            kind = "list" if origin is list else "sequence"
+            check_type = self.constant(list if origin is list else (list, tuple))
+            lines.append(f"{indent}if not isinstance({var}, {check_type}):")
+            lines.append(
+                f"{indent}    raise ValidationError('expected {kind}', {path})"
+            )
+            # Names unique to this level, so nested loops do not rebind them
+            level = self._counter
+            self._counter += 1
+            index, element = f"_i{level}", f"_e{level}"
+            item_check = self.simple_check(item_tp, element)
+            if self.needs_statements(item_tp):
+                # The helper is exec'd separately, so the parent path is passed in
+                item_lines: List[str] = []
+                item_path = f"_p + '[' + str({index}) + ']'"
+                result = self.emit_value(item_lines, "", item_tp, element, item_path)
+                helper = self.constant(None)
+                body = "\n".join(f"    {line}" for line in item_lines)
+                exec(
+                    f"def {helper}(_p, {index}, {element}):\n{body}\n"
+                    f"    return {result}\n",
+                    self.namespace,
+                )
+                lines.append(
+                    f"{indent}{var} = [{helper}({path}, {index}, {element}) "
+                    f"for {index}, {element} in enumerate({var})]"
+                )
+            elif item_check is not None:
+                lines.append(f"{indent}for {index}, {element} in enumerate({var}):")
+                lines.append(f"{indent}    if not ({item_check}):")
+                lines.append(
+                    f"{indent}        raise ValidationError('expected "
+                    f"{self.describe(item_tp)}, got ' + type({element}).__name__, "
+                    f"{path} + '[' + str({index}) + ']')"
+                )
+            return var
+        check = self.shallow_check(tp, var)
+        if check is not None:
+            lines.append(f"{indent}if not ({check}):")
+            lines.append(
+                f"{indent}    raise ValidationError("
+                f"'expected {self.describe(tp)}, got ' + type({var}).__name__, {path})"
+            )
+        return var
+
+    def emit_union(
+        self, lines: List[str], indent: str, tp: Any, var: str, path: str
+    ) -> None:
+        """Emit statements validating `var` against a union with nested members.
+
+        Members checked by an expression (such as `None`) are tried first. The
+        others are picked by their container class and fully validated; members
+        sharing a class, such as two `TypedDict`s, are tried in order.
+        """
+        simple: List[str] = []
+        groups: Dict[object, List[Any]] = {}
+        for arg in get_args(tp):
+            if self.needs_statements(arg):
+                groups.setdefault(self.container(arg), []).append(arg)
+            else:
+                simple.append(self.shallow_check(arg, var) or "True")
+        keyword = "if"
+        if simple:
+            lines.append(f"{indent}if {' or '.join(f'({c})' for c in simple)}:")
+            lines.append(f"{indent}    pass")
+            keyword = "elif"
+        for classes, members in groups.items():
+            lines.append(
+                f"{indent}{keyword} isinstance({var}, {self.constant(classes)}):"
+            )
+            keyword = "elif"
+            self.emit_alternatives(lines, indent + "    ", members, var, path)
+        lines.append(f"{indent}else:")
+        lines.append(
+            f"{indent}    raise ValidationError("
+            f"'expected {self.describe(tp)}, got ' + type({var}).__name__, {path})"
+        )
+
+    def emit_alternatives(
+        self, lines: List[str], indent: str, members: List[Any], var: str, path: str
+    ) -> None:
+        # `var` is only rebound once a member has validated it, so the next member
+        # still sees the original value
+        first, rest = members[0], members[1:]
+        if not rest:
+            self.emit_value(lines, indent, first, var, path)
+            return
+        lines.append(f"{indent}try:")
+        self.emit_value(lines, indent + "    ", first, var, path)
+        lines.append(f"{indent}except ValidationError:")
+        self.emit_alternatives(lines, indent + "    ", rest, var, path)
+
+    def describe(self, tp: Any) -> str:
+        if isinstance(tp, type) and get_origin(tp) is None:
+            text = tp.__name__
+        else:
+            text = repr(tp).replace("typing.", "")
+        return text.replace("'", '"')
+
+    def nested_validator(self, schema: type) -> str:
+        name = self.nested.get(schema)
+        if name is None:
+            name = self.constant(None)
+            self.nested[schema] = name
+            self.namespace[name] = self.record_function(schema, name)
+        return name
+
+    def record_body(self, schema: type, indent: str, src: str, path: str) -> List[str]:
+        """Emit the statements that validate `src` into a result named `_out`."""
+        hints = get_type_hints(schema)
+        required_keys: FrozenSet[str] = getattr(schema, "__required_keys__")
+        required = [key for key in hints if key in required_keys]
+        optional = [key for key in hints if key not in required_keys]
+        lines = [
+            f"{indent}if not isinstance({src}, dict):",
+            f"{indent}    raise ValidationError("
+            f"'expected dict, got ' + type({src}).__name__, {path})",
+        ]
+        values: List[Tuple[str, str, bool]] = []
+        for i, key in enumerate(required + optional):
+            var = f"_v{i}"
+            key_path = repr(key) if path == "''" else f"{path} + {('.' + key)!r}"
+            inner = indent
+            if key in required:
+                lines.append(f"{indent}try:")
+                lines.append(f"{indent}    {var} = {src}[{key!r}]")
+                lines.append(f"{indent}except KeyError:")
+                lines.append(
+                    f"{indent}    raise ValidationError("
+                    f"{('missing required key ' + repr(key))!r}, {path}) from None"
+                )
+            else:
+                lines.append(f"{indent}if {key!r} in {src}:")
+                lines.append(f"{indent}    {var} = {src}[{key!r}]")
+                lines.append(f"{indent}    _n += 1")
+                inner = indent + "    "
+            result = self.emit_value(lines, inner, hints[key], var, key_path)
+            values.append((key, result, key in required))
+
+        if optional:
+            lines.insert(2, f"{indent}_n = {len(required)}")
+            count = "_n"
+        else:
+            count = str(len(required))
+        if self.extra == "reject":
+            known = self.constant(frozenset(hints))
+            lines.append(f"{indent}if len({src}) > {count}:")
+            lines.append(
+                f"{indent}    raise ValidationError('unknown keys: ' + "
+                f"', '.join(sorted(map(repr, {src}.keys() - {known}))), {path})"
+            )
+            lines.append(f"{indent}_out = {src}")
+            return lines
+        fields = ", ".join(f"{key!r}: {var}" for key, var, req in values if req)
+        lines.append(f"{indent}_out = {{{fields}}}")
+        for key, var, req in values:
+            if not req:
+                lines.append(f"{indent}if {key!r} in {src}:")
+                lines.append(f"{indent}    _out[{key!r}] = {var}")
+        return lines
+
+    def record_function(self, schema: type, name: str) -> Callable[..., Record]:
+        body = self.record_body(schema, "    ", "record", "path")
+        source = (
+            f"def {name}(record, path=''):\n" + "\n".join(body) + "\n    return _out\n"
+        )
+        exec(source, self.namespace)
+        function: Callable[..., Record] = self.namespace[name]
+        return function
+
+
+def compile_validator(schema: type, extra: ExtraKeys = "reject") -> CompiledValidator:
+    """Generate specialized validation code for the `TypedDict` `schema`.
+
+    The schema's `__annotations__`, `__required_keys__` and `__optional_keys__` are
+    read once here, so the returned functions do no reflection per record.
+    `extra` selects whether keys not declared by the schema are rejected with a
+    `ValidationError` or stripped from the result.
+    """
+    if not is_typeddict(schema):
+        raise TypeError(f"{schema!r} is not a TypedDict")
+    compiler = _Compiler(extra)
+    single = compiler.record_body(schema, "    ", "record", "''")
+    batch = compiler.record_body(
+        schema, "        ", "record", "'[' + str(_index) + ']'"
+    )
+    source = (
+        "def validate(record):\n"
+        + "\n".join(single)
+        + "\n    return _out\n\n"
+        + "def validate_batch(records):\n"
+        + "    result = []\n"
+        + "    append = result.append\n"
+        + "    for _index, record in enumerate(records):\n"
+        + "\n".join(batch)
+        + "\n        append(_out)\n"
+        + "    return result\n"
+    )
+    exec(source, compiler.namespace)
+    return CompiledValidator(
+        schema,
+        compiler.namespace["validate"],
+        compiler.namespace["validate_batch"],
+        source,
+    )
+
+
+def validate_reflective(schema: type, record: object) -> Mapping[str, object]:
+    """Baseline validator that inspects the schema on every call."""
+    if not isinstance(record, dict):
+        raise ValidationError("expected dict")
+    hints = get_type_hints(schema)
+    for key in getattr(schema, "__required_keys__"):
+        if key not in record:
+            raise ValidationError(f"missing required key {key!r}")
+    for key, value in record.items():
+        if key not in hints:
+            raise ValidationError(f"unknown keys: {key!r}")
+        tp = hints[key]
+        if get_origin(tp) is Literal:
+            if value not in get_args(tp):
+                raise ValidationError(f"expected {tp}", key)
+        elif isinstance(tp, type) and not isinstance(value, tp):
+            raise ValidationError(f"expected {tp.__name__}", key)
+    return record
+
+
+class Inner(TypedDict):
+    x: int
+
+
+class Outer(TypedDict):
+    items: List[Inner]
+    grid: List[List[int]]
+
+
+class Optionals(TypedDict):
+    c: List[Optional[Inner]]
+    opt: Optional[Inner]
+
+
+def _rejected(validate: Callable[[Any], object], value: object, path: str) -> None:
+    try:
+        validate(value)
+    except ValidationError as exc:
+        assert exc.path == path, exc.path
+    else:
+        raise AssertionError(f"{value!r} accepted")
+
+
+def check() -> None:
+    """Check nested list, `Optional` and `TypedDict` schemas, singly and in batches."""
+    modes: Tuple[ExtraKeys, ...] = ("reject", "strip")
+    record = {"items": [{"x": 1}, {"x": 2}], "grid": [[1, 2], [3]]}
+    extended = {
+        "items": [{"x": 1, "extra": 0}],
+        "grid": [[1, 2], [3]],
+        "extra": 0,
+    }
+    for extra in modes:
+        validator = compile_validator(Outer, extra)
+        assert validator(record) == record
+        assert validator.batch([record, record]) == [record, record]
+        try:
+            validator.batch([record, {"items": [{"x": "1"}], "grid": []}])
+        except ValidationError as exc:
+            assert exc.path == "[1].items[0].x", exc.path
+        else:
+            raise AssertionError("wrong item type accepted")
+        try:
+            validator({"items": [], "grid": [[1], [2, "3"]]})
+        except ValidationError as exc:
+            assert exc.path == "grid[1][1]", exc.path
+        else:
+            raise AssertionError("wrong nested item type accepted")
+    stripped = compile_validator(Outer, "strip")
+    assert stripped(extended) == {"items": [{"x": 1}], "grid": [[1, 2], [3]]}
+    assert stripped.batch([extended]) == [stripped(extended)]
+
+    optionals = {"c": [None, {"x": 1}], "opt": {"x": 2}}
+    for extra in modes:
+        validator = compile_validator(Optionals, extra)
+        assert validator(optionals) == optionals
+        assert validator({"c": [], "opt": None}) == {"c": [], "opt": None}
+        assert validator.batch([optionals]) == [optionals]
+        _rejected(validator, {"c": [5, "x"], "opt": None}, "c[0]")
+        _rejected(validator, {"c": [{"x": "1"}], "opt": None}, "c[0].x")
+        _rejected(validator, {"c": [], "opt": {"x": "not int"}}, "opt.x")
+        _rejected(validator, {"c": [], "opt": 5}, "opt")
+        _rejected(
+            validator.batch, [optionals, {"c": [None, {}], "opt": None}], "[1].c[1]"
+        )
+    junk = {"c": [{"x": 1, "junk": 1}], "opt": {"x": 2, "junk": 1}}
+    _rejected(compile_validator(Optionals), junk, "c[0]")
+    stripped = compile_validator(Optionals, "strip")
+    assert stripped(junk) == {"c": [{"x": 1}], "opt": {"x": 2}}
+    assert stripped.batch([junk]) == [stripped(junk)]
+
+
+def benchmark(n: int = 200_000) -> None:
+    """Report validation throughput in records per second."""
+    records: List[object] = [
+        {"name": f"Movie {i}", "year": 1900 + i % 120} for i in range(n)
+    ]
+    validator = compile_validator(Movie)
+
+    def report(label: str, run: Callable[[], object]) -> None:
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        print(f"{label:<12} {n / elapsed:12,.0f} records/s")
+
+    report("reflective", lambda: [validate_reflective(Movie, r) for r in records])
+    report("compiled", lambda: [validator(r) for r in records])
+    report("batch", lambda: validator.batch(records))
+
+
+if __name__ == "__main__":
+    check()
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,217 @@
+"""Streaming JSON-lines ingest of tagged-union events."""
+
+import io
+import json
+import sys
+import time
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Tuple,
+    TypedDict,
+    Union,
+    cast,
+    get_args,
+    get_type_hints,
+)
+
+
+class NewJobEvent(TypedDict):
+    tag: Literal["new-job"]
+    job_name: str
+    config_file_path: str
+
+
+class CancelJobEvent(TypedDict):
+    tag: Literal["cancel-job"]
+    job_id: int
+
+
+Event = Union[NewJobEvent, CancelJobEvent]
+
+# Handlers are keyed by the tag literals, which are not identifiers
+EventHandlers = TypedDict(
+    "EventHandlers",
+    {
+        "new-job": Callable[[List[NewJobEvent]], None],
+        "cancel-job": Callable[[List[CancelJobEvent]], None],
+    },
+)
+
+
+def tag_table(*event_types: type) -> Dict[Any, type]:
+    """Map every `Literal` value of each type's `tag` key to that type."""
+    table: Dict[Any, type] = {}
+    for event_type in event_types:
+        for tag in get_args(get_type_hints(event_type)["tag"]):
+            if tag in table:
+                raise ValueError(f"tag {tag!r} is used by more than one event type")
+            table[tag] = event_type
+    return table
+
+
+EVENT_TYPES: Dict[Any, type] = tag_table(NewJobEvent, CancelJobEvent)
+
+
+def iter_json_lines(stream: IO[bytes], chunk_size: int = 1 << 16) -> Iterator[Any]:
+    """Parse one JSON document per line, reading `stream` in chunks.
+
+    Works on pipes as well as files: `read1` is used when the stream has it, so
+    lines are yielded as soon as they arrive rather than once a full chunk has
+    been read. Only complete lines are parsed; a partial last line is kept, as a
+    list of pieces, until its newline arrives. Blank lines are skipped.
+    """
+    loads = json.loads
+    read: Callable[[int], bytes] = getattr(stream, "read1", stream.read)
+    pieces: List[bytes] = []
+    while True:
+        chunk = read(chunk_size)
+        if not chunk:
+            break
+        if b"\n" not in chunk:
+            # Joined once the line is complete, not once per chunk
+            pieces.append(chunk)
+            continue
+        if pieces:
+            pieces.append(chunk)
+            chunk = b"".join(pieces)
+            pieces.clear()
+        lines = chunk.split(b"\n")
+        pieces.append(lines.pop())
+        for line in lines:
+            if line.strip():
+                yield loads(line)
+    pending = b"".join(pieces)
+    if pending.strip():
+        yield loads(pending)
+
+
+class BatchDispatcher:
+    """Collect events into per-tag micro-batches and hand each handler a list.
+
+    The dispatch table is built once from the `Literal` tags of the event types, so
+    routing an event is a single dict lookup instead of a chain of comparisons.
+    """
+
+    def __init__(self, handlers: EventHandlers, batch_size: int = 256) -> None:
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.batch_size = batch_size
+        self.dispatched = 0
+        self.batches_delivered = 0
+        raw_handlers = cast(Dict[str, Callable[[List[Any]], None]], handlers)
+        missing = EVENT_TYPES.keys() - raw_handlers.keys()
+        if missing:
+            raise ValueError(f"no handler for tags: {sorted(missing)}")
+        self._table: Dict[Any, Tuple[List[Any], Callable[[List[Any]], None]]] = {
+            tag: ([], raw_handlers[tag]) for tag in EVENT_TYPES
+        }
+
+    def dispatch(self, event: Event) -> None:
+        try:
+            batch, handler = self._table[event["tag"]]
+        except KeyError:
+            raise ValueError(f"unknown event tag {event.get('tag')!r}") from None
+        batch.append(event)
+        if len(batch) >= self.batch_size:
+            self._deliver(batch, handler)
+
+    def dispatch_many(self, events: Iterable[Event]) -> None:
+        table = self._table
+        batch_size = self.batch_size
+        for event in events:
+            try:
+                batch, handler = table[event["tag"]]
+            except KeyError:
+                raise ValueError(f"unknown event tag {event.get('tag')!r}") from None
+            batch.append(event)
+            if len(batch) >= batch_size:
+                self._deliver(batch, handler)
+
+    def _deliver(self, batch: List[Any], handler: Callable[[List[Any]], None]) -> None:
+        # Handlers get their own list, so they may keep it
+        events = batch[:]
+        batch.clear()
+        self.dispatched += len(events)
+        self.batches_delivered += 1
+        handler(events)
+
+    def flush(self) -> None:
+        """Deliver every partially filled batch."""
+        for batch, handler in self._table.values():
+            if batch:
+                self._deliver(batch, handler)
+
+
+def ingest(
+    stream: IO[bytes], handlers: EventHandlers, batch_size: int = 256
+) -> BatchDispatcher:
+    """Read every event from `stream`, dispatch it and flush the remainder."""
+    dispatcher = BatchDispatcher(handlers, batch_size)
+    dispatcher.dispatch_many(iter_json_lines(stream))
+    dispatcher.flush()
+    return dispatcher
+
+
+def process_event(event: Event) -> Union[str, int]:
+    """Per-event baseline, as in `tagged_unions.py` but returning what it printed."""
+    if event["tag"] == "new-job":
+        return event["job_name"]
+    else:
+        return event["job_id"]
+
+
+def benchmark(n: int = 200_000) -> None:
+    """Report events per second for batch sizes from 1 to 4096."""
+    lines = []
+    for i in range(n):
+        event: Event
+        if i % 3:
+            event = {"tag": "cancel-job", "job_id": i}
+        else:
+            event = {"tag": "new-job", "job_name": f"job-{i}", "config_file_path": "c"}
+        lines.append(json.dumps(event))
+    payload = ("\n".join(lines) + "\n").encode("utf-8")
+
+    def count(events: List[Any]) -> None:
+        for event in events:
+            process_event(event)
+
+    handlers: EventHandlers = {"new-job": count, "cancel-job": count}
+
+    def report(label: str, run: Callable[[], object]) -> None:
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        print(f"{label:<16} {n / elapsed:12,.0f} events/s")
+
+    def per_event() -> None:
+        for event in iter_json_lines(io.BytesIO(payload)):
+            process_event(event)
+
+    report("per event", per_event)
+    batch_size = 1
+    while batch_size <= 4096:
+        report(
+            f"batch size {batch_size}",
+            lambda: ingest(io.BytesIO(payload), handlers, batch_size),
+        )
+        batch_size *= 4
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "-":
+        # Ingest from a pipe: python event_ingest.py - < events.jsonl
+        stats = ingest(
+            sys.stdin.buffer,
+            {"new-job": lambda batch: None, "cancel-job": lambda batch: None},
+        )
+        print(f"{stats.dispatched} events in {stats.batches_delivered} batches")
+    else:
+        benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,188 @@
+"""A byte-budgeted LRU cache in front of `fetch_data`."""
+
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Literal, Tuple, Union, overload
+
+from fetch_data import fetch_data
+
+Key = Tuple[str, bool]
+Data = Union[bytes, str]
+
+
+def size_of(data: Data) -> int:
+    """Bytes charged against the budget: the payload of `bytes`, the whole `str`."""
+    return len(data) if isinstance(data, bytes) else sys.getsizeof(data)
+
+
+class CacheStats:
+    """Counters of a `FetchCache`."""
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        # Decoded requests served by decoding cached raw bytes
+        self.raw_reuses = 0
+        # Misses that waited for another thread's fetch of the same key
+        self.coalesced = 0
+        self.evictions = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of requests served without reading the source."""
+        requests = self.hits + self.misses
+        return (self.hits + self.raw_reuses) / requests if requests else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"CacheStats(hits={self.hits}, misses={self.misses}, "
+            f"raw_reuses={self.raw_reuses}, coalesced={self.coalesced}, "
+            f"evictions={self.evictions}, hit_rate={self.hit_rate:.1%})"
+        )
+
+
+class FetchCache:
+    """LRU cache of `fetch_data` results keyed by `(source, raw)`.
+
+    Entries are evicted, least recently used first, once their total size exceeds
+    `max_bytes`; an entry larger than the whole budget is returned but not kept.
+    Text is decoded with `encoding`, which is passed on to `fetch`.
+    A decoded request for a source whose raw bytes are cached decodes those bytes
+    instead of reading the file again. Concurrent misses for the same key are
+    single-flight: one thread fetches, the others wait for its result.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        fetch: Callable[[str, bool, str], Data] = fetch_data,
+        encoding: str = "utf-8",
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.fetch = fetch
+        self.encoding = encoding
+        self.stats = CacheStats()
+        self.size = 0
+        self._entries: "OrderedDict[Key, Data]" = OrderedDict()
+        self._in_flight: Dict[Key, "Future[Data]"] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @overload
+    def get(self, source: str, raw: Literal[True]) -> bytes:
+        ...
+
+    @overload
+    def get(self, source: str, raw: Literal[False]) -> str:
+        ...
+
+    @overload
+    def get(self, source: str, raw: bool) -> Data:
+        ...
+
+    def get(self, source: str, raw: bool) -> Data:
+        key = (source, raw)
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                return data
+            self.stats.misses += 1
+            if not raw:
+                cached_raw = self._entries.get((source, True))
+                if cached_raw is not None:
+                    self._entries.move_to_end((source, True))
+                    self.stats.raw_reuses += 1
+            else:
+                cached_raw = None
+            future = self._in_flight.get(key)
+            leader = future is None
+            if future is None:
+                future = self._in_flight[key] = Future()
+            else:
+                self.stats.coalesced += 1
+        if not leader:
+            return future.result()
+
+        try:
+            if cached_raw is not None:
+                assert isinstance(cached_raw, bytes)
+                data = cached_raw.decode(self.encoding)
+            else:
+                data = self.fetch(source, raw, self.encoding)
+        except BaseException as exc:
+            with self._lock:
+                del self._in_flight[key]
+            future.set_exception(exc)
+            raise
+        with self._lock:
+            del self._in_flight[key]
+            self._store(key, data)
+        future.set_result(data)
+        return data
+
+    def _store(self, key: Key, data: Data) -> None:
+        size = size_of(data)
+        if size > self.max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.size -= size_of(previous)
+        self._entries[key] = data
+        self.size += size
+        while self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= size_of(evicted)
+            self.stats.evictions += 1
+
+    def invalidate(self, source: str) -> None:
+        """Drop both the raw and decoded entries of `source`."""
+        with self._lock:
+            for raw in (True, False):
+                data = self._entries.pop((source, raw), None)
+                if data is not None:
+                    self.size -= size_of(data)
+
+
+def benchmark(
+    files: int = 32, file_size: int = 256 << 10, requests: int = 5000
+) -> None:
+    """Replay a skewed request mix from 8 threads and report hit rate and speed."""
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(files):
+            path = os.path.join(tmp, f"data-{i}.txt")
+            with open(path, "w", encoding="utf-8") as out:
+                out.write(f"file {i} ✓ " * (file_size // 12))
+            paths.append(path)
+        # Skewed popularity: low-numbered files are requested far more often
+        rng = random.Random(0)
+        mix = [
+            (paths[min(int(rng.paretovariate(1.0)) - 1, files - 1)], rng.random() < 0.3)
+            for _ in range(requests)
+        ]
+
+        cache = FetchCache(max_bytes=files * file_size // 4)
+        for label, get in (
+            ("uncached", lambda key: fetch_data(key[0], key[1], cache.encoding)),
+            ("cached", lambda key: cache.get(*key)),
+        ):
+            start = time.perf_counter()
+            with ThreadPoolExecutor(8) as pool:
+                list(pool.map(get, mix))
+            elapsed = time.perf_counter() - start
+            print(f"{label:<9} {requests / elapsed:10,.0f} requests/s")
+        print(cache.stats)
+
+
+if __name__ == "__main__":
+    benchmark()
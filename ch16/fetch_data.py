@@ -0,0 +1,140 @@
+"""File-backed `fetch_data` with raw and decoded, whole and streaming variants."""
+
+import codecs
+import os
+import sys
+import tempfile
+import time
+from typing import Callable, Iterator, List, Literal, Tuple, Union, overload
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+
+@overload
+def fetch_data(source: str, raw: Literal[True], encoding: str = ...) -> bytes:
+    ...
+
+
+@overload
+def fetch_data(source: str, raw: Literal[False], encoding: str = ...) -> str:
+    ...
+
+
+@overload
+def fetch_data(source: str, raw: bool, encoding: str = ...) -> Union[bytes, str]:
+    ...
+
+
+def fetch_data(source: str, raw: bool, encoding: str = "utf-8") -> Union[bytes, str]:
+    """Read the whole file at `source`, as `bytes` if `raw` else decoded text."""
+    with open(source, "rb", buffering=0) as src:
+        # An unbuffered read of a known size fills one bytes object directly
+        data = src.read(os.fstat(src.fileno()).st_size)
+        rest = src.read()
+        if rest:
+            # The file grew after it was opened
+            data += rest
+    if raw:
+        return data
+    return data.decode(encoding)
+
+
+@overload
+def iter_data(
+    source: str,
+    raw: Literal[True],
+    chunk_size: int = ...,
+    encoding: str = ...,
+) -> Iterator[memoryview]:
+    ...
+
+
+@overload
+def iter_data(
+    source: str,
+    raw: Literal[False],
+    chunk_size: int = ...,
+    encoding: str = ...,
+) -> Iterator[str]:
+    ...
+
+
+@overload
+def iter_data(
+    source: str, raw: bool, chunk_size: int = ..., encoding: str = ...
+) -> Iterator[Union[memoryview, str]]:
+    ...
+
+
+def iter_data(
+    source: str,
+    raw: bool,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    encoding: str = "utf-8",
+) -> Iterator[Union[memoryview, str]]:
+    """Stream the file at `source` in chunks of at most `chunk_size` bytes.
+
+    With `raw`, chunks are `memoryview`s over one reused buffer that the file is
+    read into, so nothing is copied; each view is only valid until the next chunk
+    is requested, so call `bytes()` on it to keep it. Otherwise chunks are decoded
+    incrementally, so a multi-byte character split across a chunk boundary is
+    carried over and decoded with the next chunk.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    if raw:
+        return _iter_raw(source, chunk_size)
+    return _iter_decoded(source, chunk_size, encoding)
+
+
+def _iter_raw(source: str, chunk_size: int) -> Iterator[memoryview]:
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    with open(source, "rb", buffering=0) as src:
+        while True:
+            count = src.readinto(buffer)
+            if not count:
+                break
+            chunk = view[:count]
+            try:
+                yield chunk
+            finally:
+                # Views must not outlive the buffer's next fill
+                chunk.release()
+
+
+def _iter_decoded(source: str, chunk_size: int, encoding: str) -> Iterator[str]:
+    decoder = codecs.getincrementaldecoder(encoding)()
+    for chunk in _iter_raw(source, chunk_size):
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def benchmark(size: int = 64 << 20) -> None:
+    """Compare whole-file and streaming reads of a UTF-8 file of `size` bytes."""
+    line = "fetch_data → ünïcödé ✓\n".encode("utf-8")
+    with tempfile.NamedTemporaryFile(delete=False) as tmp:
+        tmp.write(line * (size // len(line)))
+        path = tmp.name
+    try:
+        runs: List[Tuple[str, Callable[[], int]]] = [
+            ("fetch raw", lambda: len(fetch_data(path, True))),
+            ("fetch decoded", lambda: len(fetch_data(path, False))),
+            ("stream raw", lambda: sum(map(len, iter_data(path, True)))),
+            ("stream decoded", lambda: sum(map(len, iter_data(path, False)))),
+        ]
+        for label, run in runs:
+            start = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - start
+            print(f"{label:<16} {size / elapsed / (1 << 20):10,.0f} MiB/s")
+    finally:
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 64 << 20)
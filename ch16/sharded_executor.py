@@ -0,0 +1,298 @@
+"""Key-ordered, multi-process execution of job events."""
+
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+import time
+import zlib
+from types import TracebackType
+from typing import (
+    Any,
+    Callable,
+    Generic,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+from event_ingest import Event
+
+E = TypeVar("E")
+R = TypeVar("R")
+
+# (sequence number, succeeded, result or exception)
+Outcome = Tuple[int, bool, Any]
+
+
+def job_key(event: Event) -> Hashable:
+    """Return the job an event belongs to."""
+    if event["tag"] == "new-job":
+        return event["job_name"]
+    else:
+        return event["job_id"]
+
+
+def stable_hash(key: Hashable) -> int:
+    """Hash `key` the same way in every process (`hash(str)` is salted per process)."""
+    if isinstance(key, int):
+        return key
+    return zlib.crc32(repr(key).encode("utf-8"))
+
+
+def describe_event(event: Event) -> str:
+    """Picklable stand-in for `process_event` that returns instead of printing."""
+    if event["tag"] == "new-job":
+        return f"new {event['job_name']}"
+    else:
+        return f"cancel {event['job_id']}"
+
+
+def _worker(
+    func: Callable[[Any], Any],
+    inbox: "multiprocessing.Queue[Optional[List[Tuple[int, Any]]]]",
+    outbox: "multiprocessing.Queue[Optional[List[Outcome]]]",
+) -> None:
+    while True:
+        chunk = inbox.get()
+        if chunk is None:
+            outbox.put(None)
+            return
+        outcomes: List[Outcome] = []
+        for seq, item in chunk:
+            try:
+                outcomes.append((seq, True, func(item)))
+            except Exception as exc:
+                outcomes.append((seq, False, exc))
+        outbox.put(outcomes)
+
+
+class ShardedExecutor(Generic[E, R]):
+    """Run `func` over events in worker processes, one shard per process.
+
+    Events are routed by a stable hash of `key(event)`, and each shard processes its
+    queue in order, so results for the same key come back in submission order. Each
+    shard's queue holds at most `queue_size` chunks of `chunk_size` events; when it
+    is full, submitting blocks, which applies backpressure to the producer.
+    """
+
+    def __init__(
+        self,
+        func: Callable[[E], R],
+        workers: Optional[int] = None,
+        key: Callable[[Any], Hashable] = job_key,
+        queue_size: int = 16,
+        chunk_size: int = 64,
+    ) -> None:
+        self.workers = workers or os.cpu_count() or 1
+        self.key = key
+        self.chunk_size = chunk_size
+        self._outbox: "multiprocessing.Queue[Optional[List[Outcome]]]" = (
+            multiprocessing.Queue()
+        )
+        self._inboxes: "List[multiprocessing.Queue[Optional[List[Tuple[int, Any]]]]]"
+        self._inboxes = [
+            multiprocessing.Queue(maxsize=queue_size) for _ in range(self.workers)
+        ]
+        self._pending: List[List[Tuple[int, Any]]] = [[] for _ in range(self.workers)]
+        self._processes = [
+            multiprocessing.Process(
+                target=_worker, args=(func, inbox, self._outbox), daemon=True
+            )
+            for inbox in self._inboxes
+        ]
+        for process in self._processes:
+            process.start()
+        self._closed = False
+        self._broken = False
+        # The thread submitting the events of the current `map`, and its stop flag
+        self._feeder: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def __enter__(self) -> "ShardedExecutor[E, R]":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def shard_of(self, event: E) -> int:
+        return stable_hash(self.key(event)) % self.workers
+
+    def _check_worker(self, shard: int) -> None:
+        process = self._processes[shard]
+        if not process.is_alive():
+            raise RuntimeError(
+                f"worker {shard} exited unexpectedly with code {process.exitcode}"
+            )
+
+    def _put(self, shard: int, chunk: Optional[List[Tuple[int, Any]]]) -> None:
+        # A full queue is never drained by a dead worker, so do not wait for it
+        inbox = self._inboxes[shard]
+        while True:
+            try:
+                inbox.put(chunk, timeout=0.05)
+                return
+            except queue.Full:
+                self._check_worker(shard)
+
+    def _submit(self, seq: int, event: E) -> None:
+        shard = self.shard_of(event)
+        pending = self._pending[shard]
+        pending.append((seq, event))
+        if len(pending) >= self.chunk_size:
+            self._put(shard, pending)
+            self._pending[shard] = []
+
+    def _flush(self) -> None:
+        for shard, pending in enumerate(self._pending):
+            if pending:
+                self._put(shard, pending)
+                self._pending[shard] = []
+
+    def map(self, events: Iterable[E]) -> Iterator[Tuple[int, R]]:
+        """Process `events`, yielding `(sequence number, result)` as results arrive.
+
+        The output merges all shards, so it is ordered per key but not globally;
+        sort by sequence number if the original order is needed. The first failure
+        in a worker is re-raised here, after which the executor can only be closed.
+        """
+        if self._closed or self._broken:
+            raise RuntimeError("executor is closed")
+        # Stays set if the caller stops early or a worker fails, since results of
+        # this run would still be in flight
+        self._broken = True
+        submitted = 0
+        done = threading.Event()
+        stop = self._stop
+        failure: List[BaseException] = []
+
+        def feed() -> None:
+            nonlocal submitted
+            try:
+                for seq, event in enumerate(events):
+                    if stop.is_set():
+                        return
+                    self._submit(seq, event)
+                    submitted = seq + 1
+                self._flush()
+            except BaseException as exc:
+                failure.append(exc)
+            finally:
+                done.set()
+
+        feeder = self._feeder = threading.Thread(target=feed, daemon=True)
+        feeder.start()
+        try:
+            received = 0
+            while not (done.is_set() and received >= submitted):
+                try:
+                    outcomes = self._outbox.get(timeout=0.05)
+                except queue.Empty:
+                    for shard in range(self.workers):
+                        self._check_worker(shard)
+                    continue
+                if outcomes is None:
+                    raise RuntimeError("worker exited unexpectedly")
+                for seq, ok, value in outcomes:
+                    received += 1
+                    if not ok:
+                        raise value
+                    yield seq, value
+        finally:
+            # Also reached when the caller stops iterating early
+            self._stop_feeder()
+        if failure:
+            raise failure[0]
+        self._broken = False
+
+    def _stop_feeder(self) -> None:
+        feeder = self._feeder
+        if feeder is not None:
+            self._stop.set()
+            # Returns after at most one more chunk, which the workers will drain
+            feeder.join()
+            self._feeder = None
+            self._stop = threading.Event()
+
+    def close(self) -> None:
+        """Stop the workers after they finish the events already queued.
+
+        Workers that have died are skipped rather than waited for.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        # `_pending` is the feeder's until it has stopped
+        self._stop_feeder()
+        for shard, pending in enumerate(self._pending):
+            try:
+                if pending:
+                    self._put(shard, pending)
+                self._put(shard, None)
+            except RuntimeError:
+                # A dead worker has nothing left to stop
+                pass
+        # Drain undelivered results so no worker blocks on exit flushing its queue
+        stopped = 0
+        while stopped < self.workers:
+            try:
+                outcomes = self._outbox.get(timeout=0.05)
+            except queue.Empty:
+                # Live workers send None before exiting, so once none is alive
+                # nothing more can arrive
+                if not any(process.is_alive() for process in self._processes):
+                    break
+                continue
+            if outcomes is None:
+                stopped += 1
+        for process in self._processes:
+            process.join()
+
+
+def busy_describe(event: Event) -> str:
+    """`describe_event` plus a fixed amount of CPU work, for benchmarking."""
+    total = 0
+    for i in range(2000):
+        total += i * i
+    return describe_event(event)
+
+
+def benchmark(n: int = 20_000) -> None:
+    """Report throughput and scaling efficiency as worker processes are added."""
+    events: List[Event] = []
+    for i in range(n):
+        if i % 2:
+            events.append({"tag": "cancel-job", "job_id": i % 500})
+        else:
+            name = f"job-{i % 500}"
+            events.append({"tag": "new-job", "job_name": name, "config_file_path": "c"})
+    baseline = 0.0
+    workers = 1
+    while workers <= max(os.cpu_count() or 1, 2):
+        with ShardedExecutor(busy_describe, workers=workers) as executor:
+            start = time.perf_counter()
+            count = sum(1 for _ in executor.map(events))
+            elapsed = time.perf_counter() - start
+        assert count == n
+        rate = n / elapsed
+        baseline = baseline or rate
+        efficiency = rate / (baseline * workers)
+        print(
+            f"{workers:3} workers {rate:12,.0f} events/s {efficiency:6.0%} efficiency"
+        )
+        workers *= 2
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
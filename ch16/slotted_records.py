@@ -0,0 +1,208 @@
+"""Slotted record classes generated from `TypedDict` definitions."""
+
+import keyword
+import operator
+import sys
+import time
+import tracemalloc
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    Final,
+    FrozenSet,
+    Iterator,
+    List,
+    Literal,
+    Mapping,
+    Tuple,
+    Type,
+    TypedDict,
+    TypeVar,
+    get_type_hints,
+)
+
+
+class MyDict(TypedDict):
+    name: str
+    main_id: int
+    backup_id: int
+
+
+name_key: Final = "name"
+id_key: Literal["main_id", "backup_id"] = "main_id"
+
+R = TypeVar("R", bound="SlottedRecord")
+
+
+class SlottedRecord:
+    """Base class of generated records; stores each key in its own slot.
+
+    Records support the read-only `Mapping` operations of the `TypedDict` they were
+    generated from. `_offsets` maps every key to its slot index and `_getters` holds
+    one slot reader per index, so `record[key]` is a single table lookup and a slot
+    read, with no per-instance dict.
+    """
+
+    __slots__ = ()
+
+    _fields: ClassVar[Tuple[str, ...]] = ()
+    _required: ClassVar[FrozenSet[str]] = frozenset()
+    _offsets: ClassVar[Dict[str, int]] = {}
+    _getters: ClassVar[Tuple[Callable[[Any], Any], ...]] = ()
+
+    def __init__(self, **values: Any) -> None:
+        # Replaced by a generated, per-schema `__init__` in subclasses
+        for key, value in values.items():
+            setattr(self, key, value)
+
+    @classmethod
+    def offset(cls, key: str) -> int:
+        """Return the slot index of `key`; resolve literal keys once, outside loops."""
+        return cls._offsets[key]
+
+    @classmethod
+    def getter(cls, key: str) -> Callable[[Any], Any]:
+        """Return a C-level reader for `key`, the fastest way to read one key."""
+        return operator.attrgetter(cls._fields[cls._offsets[key]])
+
+    @classmethod
+    def from_dict(cls: Type[R], data: Mapping[str, Any]) -> R:
+        return cls(**data)
+
+    def slot(self, offset: int) -> Any:
+        return self._getters[offset](self)
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self._getters[self._offsets[key]](self)
+        except (KeyError, AttributeError):
+            raise KeyError(key) from None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and key in self._offsets and hasattr(self, key)
+
+    def keys(self) -> List[str]:
+        return [key for key in self._fields if hasattr(self, key)]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: getattr(self, key) for key in self.keys()}
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, SlottedRecord):
+            return self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+def make_record_class(schema: type, name: str = "") -> Type[SlottedRecord]:
+    """Generate a `SlottedRecord` subclass with one slot per key of `schema`.
+
+    Keys must be valid identifiers that are not keywords and do not clash with
+    `SlottedRecord`. The generated `__init__` takes every key as a keyword
+    argument; optional keys of non-total `TypedDict`s may be omitted and leave
+    their slot unset.
+    """
+    fields = tuple(get_type_hints(schema))
+    for key in fields:
+        if (
+            not key.isidentifier()
+            or keyword.iskeyword(key)
+            or hasattr(SlottedRecord, key)
+        ):
+            raise ValueError(f"key {key!r} cannot be used as a slot name")
+    required: FrozenSet[str] = getattr(schema, "__required_keys__", frozenset(fields))
+    # Unset optional slots are marked by a sentinel default, then deleted
+    params = ", ".join(key if key in required else f"{key}=_MISSING" for key in fields)
+    body = [f"    self.{key} = {key}" for key in fields if key in required]
+    for key in fields:
+        if key not in required:
+            body.append(f"    if {key} is not _MISSING:")
+            body.append(f"        self.{key} = {key}")
+    source = f"def __init__(self, *, {params}):\n" + ("\n".join(body) or "    pass")
+    namespace: Dict[str, Any] = {"_MISSING": object()}
+    exec(source, namespace)
+
+    cls = type(
+        name or f"{schema.__name__}Record",
+        (SlottedRecord,),
+        {
+            "__slots__": fields,
+            "__init__": namespace["__init__"],
+            "_fields": fields,
+            "_required": required,
+            "_offsets": {key: i for i, key in enumerate(fields)},
+        },
+    )
+    # Slot member descriptors read the instance layout directly
+    getters = tuple(cls.__dict__[key].__get__ for key in fields)
+    table = dict(zip(fields, getters)).__getitem__
+
+    def __getitem__(self: SlottedRecord, key: str) -> Any:
+        try:
+            return table(key)(self)
+        except (KeyError, AttributeError):
+            raise KeyError(key) from None
+
+    setattr(cls, "_getters", getters)
+    setattr(cls, "__getitem__", __getitem__)
+    return cls
+
+
+MyRecord = make_record_class(MyDict)
+
+
+def benchmark(n: int = 200_000) -> None:
+    """Compare memory and literal-key access of `MyDict` dicts and `MyRecord`."""
+    # Values are shared by both layouts so only the containers are measured
+    ids = list(range(n + 1))
+    tracemalloc.start()
+    dicts: List[MyDict] = [
+        {"name": "Saanvi", "main_id": ids[i], "backup_id": ids[i + 1]} for i in range(n)
+    ]
+    dict_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    records = [
+        MyRecord(name="Saanvi", main_id=ids[i], backup_id=ids[i + 1]) for i in range(n)
+    ]
+    record_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    def report(label: str, run: Callable[[], int]) -> None:
+        start = time.perf_counter()
+        total = run()
+        elapsed = time.perf_counter() - start
+        assert total == n * (n - 1) // 2
+        print(f"{label:<24} {elapsed / n * 1e9:8.1f} ns/access")
+
+    get_main_id = MyRecord.getter(id_key)
+    print(f"dict:   {dict_bytes / n:6.1f} B/record")
+    print(f"record: {record_bytes / n:6.1f} B/record")
+    report("dict[id_key]", lambda: sum(d[id_key] for d in dicts))
+    report("record[id_key]", lambda: sum(r[id_key] for r in records))
+    report("record getter(id_key)", lambda: sum(map(get_main_id, records)))
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
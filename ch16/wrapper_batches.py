@@ -0,0 +1,152 @@
+"""Batch processing of `Wrapper[int]` and `Wrapper[str]` grouped by runtime type."""
+
+import sys
+import time
+from array import array
+from itertools import compress, islice, repeat
+from operator import attrgetter, is_
+from typing import (
+    Any,
+    Callable,
+    Generic,
+    Iterable,
+    List,
+    Tuple,
+    Optional,
+    Sequence,
+    TypeVar,
+    Union,
+)
+
+T = TypeVar("T")
+R = TypeVar("R")
+S = TypeVar("S")
+
+
+class Wrapper(Generic[T]):
+    """Same as `Wrapper` in `tagged_unions.py`."""
+
+    def __init__(self, inner: T) -> None:
+        self.inner = inner
+
+
+def _pack(values: Iterable[int]) -> Sequence[int]:
+    values = list(values)
+    try:
+        return array("q", values)
+    except OverflowError:
+        # Outside the int64 range: leave this round unpacked
+        return values
+
+
+class WrapperBatcher(Generic[R, S]):
+    """Split a stream of wrappers into homogeneous `int` and `str` batches.
+
+    Wrappers are consumed `batch_size` at a time. Each round is partitioned by the
+    exact class of `inner` with C-level passes (`map`, `operator.is_`, `compress`)
+    instead of an `isinstance` call per object in Python code; only a round that
+    contains subclasses such as `bool` falls back to `isinstance`. `int` values are
+    packed into a typed `array("q")`, so `on_ints` can use whole-array operations;
+    a round holding an int outside the 64-bit range gets a plain list instead.
+    Order is preserved within each batch.
+    """
+
+    def __init__(
+        self,
+        on_ints: Callable[[Sequence[int]], R],
+        on_strs: Callable[[List[str]], S],
+        batch_size: int = 65536,
+    ) -> None:
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.on_ints = on_ints
+        self.on_strs = on_strs
+        self.batch_size = batch_size
+
+    def partition(self, inners: List[Any]) -> Tuple[Sequence[int], List[str]]:
+        """Split inner values into packed ints and strs, keeping their order."""
+        kinds = list(map(type, inners))
+        is_int = list(map(is_, kinds, repeat(int)))
+        is_str = list(map(is_, kinds, repeat(str)))
+        ints = _pack(compress(inners, is_int))
+        strs: List[str] = list(compress(inners, is_str))
+        if len(ints) + len(strs) == len(inners):
+            return ints, strs
+        is_int = [isinstance(inner, int) for inner in inners]
+        is_str = [isinstance(inner, str) for inner in inners]
+        for inner, as_int, as_str in zip(inners, is_int, is_str):
+            if not (as_int or as_str):
+                raise TypeError(f"unsupported inner type {type(inner).__name__}")
+        ints = _pack(map(int, compress(inners, is_int)))
+        strs = list(map(str, compress(inners, is_str)))
+        return ints, strs
+
+    def run(
+        self, wrappers: Iterable[Union[Wrapper[int], Wrapper[str]]]
+    ) -> Tuple[List[R], List[S]]:
+        """Process every wrapper; return the results of each handler call."""
+        int_results: List[R] = []
+        str_results: List[S] = []
+        get_inner = attrgetter("inner")
+        stream = iter(wrappers)
+        while True:
+            inners = list(map(get_inner, islice(stream, self.batch_size)))
+            if not inners:
+                break
+            ints, strs = self.partition(inners)
+            if ints:
+                int_results.append(self.on_ints(ints))
+            if strs:
+                str_results.append(self.on_strs(strs))
+        return int_results, str_results
+
+
+def summarize_ints(values: Sequence[int]) -> Tuple[int, int, int]:
+    """Example vectorized handler: count, sum and maximum of a batch."""
+    return len(values), sum(values), max(values)
+
+
+def summarize_strs(values: List[str]) -> Tuple[int, int]:
+    """Example handler: count and total length of a batch."""
+    return len(values), sum(map(len, values))
+
+
+def summarize_per_object(
+    wrappers: Iterable[Union[Wrapper[int], Wrapper[str]]],
+) -> Tuple[Tuple[int, int, int], Tuple[int, int]]:
+    """Baseline that narrows each wrapper with `isinstance`, as in `process`."""
+    count = total = count_strs = length = 0
+    largest: Optional[int] = None
+    for w in wrappers:
+        if isinstance(w.inner, int):
+            count += 1
+            total += w.inner
+            if largest is None or w.inner > largest:
+                largest = w.inner
+        else:
+            count_strs += 1
+            length += len(w.inner)
+    return (count, total, largest or 0), (count_strs, length)
+
+
+def benchmark(n: int = 1_000_000) -> None:
+    """Compare per-object narrowing with grouped batches."""
+    wrappers: List[Union[Wrapper[int], Wrapper[str]]] = [
+        Wrapper(i) if i % 2 else Wrapper(str(i)) for i in range(n)
+    ]
+
+    start = time.perf_counter()
+    summarize_per_object(wrappers)
+    per_object = time.perf_counter() - start
+
+    for batch_size in (4096, 65536):
+        batcher = WrapperBatcher(summarize_ints, summarize_strs, batch_size)
+        start = time.perf_counter()
+        batcher.run(wrappers)
+        batched = time.perf_counter() - start
+        print(f"batch size {batch_size:<6} {batched:.3f} s")
+    print(f"per object:        {per_object:.3f} s")
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,94 @@
+"""Interned, hash-cached `ImmutablePoint` value objects."""
+
+import sys
+import time
+import tracemalloc
+import weakref
+from typing import Any, Callable, Dict, Final, List, Tuple
+
+
+class ImmutablePoint:
+    """Immutable point with structural equality and a hash computed once.
+
+    `ImmutablePoint(x, y)` always builds a new instance; `ImmutablePoint.of(x, y)`
+    returns the live instance equal to it if there is one, so that duplicates
+    share memory and compare by identity first.
+    """
+
+    __slots__ = ("x", "y", "_hash", "__weakref__")
+
+    # Read-only at runtime: assignments are refused by `__setattr__`
+    x: int
+    y: int
+    _hash: int
+
+    _interned: "Final[weakref.WeakValueDictionary[Tuple[int, int], ImmutablePoint]]" = (
+        weakref.WeakValueDictionary()
+    )
+
+    def __init__(self, x: int, y: int) -> None:
+        setattr_ = object.__setattr__
+        setattr_(self, "x", x)
+        setattr_(self, "y", y)
+        # Equal to the hash of the tuple (x, y)
+        setattr_(self, "_hash", hash((x, y)))
+
+    @classmethod
+    def of(cls, x: int, y: int) -> "ImmutablePoint":
+        """The interned point at `(x, y)`, created if no live one exists."""
+        key = (x, y)
+        point = cls._interned.get(key)
+        if point is None:
+            point = cls._interned[key] = cls(x, y)
+        return point
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("ImmutablePoint is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("ImmutablePoint is immutable")
+
+    def __repr__(self) -> str:
+        return f"ImmutablePoint({self.x}, {self.y})"
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, ImmutablePoint):
+            return NotImplemented
+        return self._hash == other._hash and self.x == other.x and self.y == other.y
+
+    def __reduce__(
+        self,
+    ) -> Tuple[Callable[[int, int], "ImmutablePoint"], Tuple[int, int]]:
+        return type(self), (self.x, self.y)
+
+
+def benchmark(n: int = 1_000_000, distinct: int = 1000) -> None:
+    """Compare memory and dict-key lookups of tuples, points and interned points."""
+    coords = [(i % distinct, i % distinct * 7) for i in range(n)]
+
+    makers: List[Tuple[str, Callable[[int, int], Any]]] = [
+        ("tuple", lambda x, y: (x, y)),
+        ("ImmutablePoint", ImmutablePoint),
+        ("interned", ImmutablePoint.of),
+    ]
+    for label, make in makers:
+        tracemalloc.start()
+        points = [make(x, y) for x, y in coords]
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        table: Dict[Any, int] = {point: i for i, point in enumerate(points)}
+        start = time.perf_counter()
+        for point in points:
+            table[point]
+        elapsed = time.perf_counter() - start
+        print(f"{label:<15} {memory / n:7.1f} B/point {n / elapsed:14,.0f} lookups/s")
+        del points, table
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)